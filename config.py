@@ -2,10 +2,12 @@
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 from dotenv import load_dotenv
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SMTPConfig:
     """SMTP server configuration."""
     host: str
@@ -14,7 +16,7 @@ class SMTPConfig:
     username: str
     password: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IMAPConfig:
     """IMAP server configuration."""
     host: str
@@ -23,7 +25,7 @@ class IMAPConfig:
     username: str
     password: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     """Application configuration."""
     log_level: str
@@ -32,8 +34,14 @@ class AppConfig:
     smtp: SMTPConfig
     imap: IMAPConfig
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
-    """Load configuration from .env file."""
+    """Load configuration from .env file.
+
+    The result is cached for the lifetime of the process so repeated calls
+    don't re-parse .env or re-read the environment. Call
+    ``load_config.cache_clear()`` to force a reload.
+    """
     load_dotenv()
     
     # SMTP Configuration
@@ -63,25 +71,25 @@ def load_config() -> AppConfig:
         imap=imap_config
     )
 
+# Required fields as prebuilt attrgetters so validation is one loop over a
+# tuple rather than a ladder of hand-written branches
+_REQUIRED_FIELDS = tuple(
+    (attrgetter(path), f"{env_name} is required")
+    for path, env_name in (
+        ("smtp.host", "SMTP_HOST"),
+        ("smtp.username", "SMTP_USERNAME"),
+        ("smtp.password", "SMTP_PASSWORD"),
+        ("imap.host", "IMAP_HOST"),
+        ("imap.username", "IMAP_USERNAME"),
+        ("imap.password", "IMAP_PASSWORD"),
+    )
+)
+
 def validate_config(config: AppConfig) -> list[str]:
     """Validate configuration and return list of errors."""
-    errors = []
-    
-    if not config.smtp.host:
-        errors.append("SMTP_HOST is required")
-    if not config.smtp.username:
-        errors.append("SMTP_USERNAME is required")
-    if not config.smtp.password:
-        errors.append("SMTP_PASSWORD is required")
-    
-    if not config.imap.host:
-        errors.append("IMAP_HOST is required")
-    if not config.imap.username:
-        errors.append("IMAP_USERNAME is required")
-    if not config.imap.password:
-        errors.append("IMAP_PASSWORD is required")
-    
+    errors = [message for getter, message in _REQUIRED_FIELDS if not getter(config)]
+
     if config.max_attachment_size < 1:
         errors.append("MAX_ATTACHMENT_SIZE must be at least 1MB")
-    
+
     return errors
\ No newline at end of file
@@ -1,6 +1,9 @@
 """Rich-based dashboard for email investigation tool."""
 
+import threading
 import time
+from collections import deque
+from itertools import islice
 from typing import List, Optional, Callable
 from datetime import datetime
 from rich.console import Console
@@ -23,16 +26,22 @@ from network_monitor import NetworkMonitor
 class Dashboard:
     """Main dashboard interface."""
     
+    # Layout slots that update_display knows how to rebuild
+    _PANELS = ("header", "smtp_log", "network_analysis", "email_composition",
+               "file_management", "statistics", "footer")
+    
     def __init__(self, theme_manager: ThemeManager, network_monitor: Optional[NetworkMonitor] = None):
         self.console = Console(theme=theme_manager.rich_theme)
         self.theme = theme_manager
         self.layout = Layout()
-        self.smtp_log: List[SMTPLogEntry] = []
+        self.smtp_log: deque[SMTPLogEntry] = deque(maxlen=50)
         self.network_analysis: Optional[NetworkPath] = None
         self.isp_analysis: Optional[ISPAnalysis] = None
-        self.port_scan_results: List[PortScanResult] = []
+        self.port_scan_results: deque[PortScanResult] = deque(maxlen=100)
         self.current_stats: Optional[SMTPStats] = None
-        self.generated_files: List[FileInfo] = []
+        # Bounded like smtp_log: only the tail is ever displayed, and
+        # long-running sessions shouldn't accumulate records forever
+        self.generated_files: deque[FileInfo] = deque(maxlen=200)
         self.imap_folders: List[IMAPFolder] = []
         self.inbox_messages: List[EmailMessage] = []
         self.network_monitor = network_monitor
@@ -45,7 +54,90 @@ class Dashboard:
         self.gpg_sign = False
         self.gpg_encrypt = False
         
+        # Panels start dirty so the first render builds everything
+        self._dirty = dict.fromkeys(self._PANELS, True)
+        self._dirty_lock = threading.Lock()
+        
+        # High-frequency mutators (SMTP log callbacks, traceroute updates)
+        # only mark panels dirty; this loop coalesces them into rebuilds at
+        # a fixed cadence instead of one rebuild per event.
+        self.render_hz = 10
+        
+        self._refresh_style_cache()
         self._setup_layout()
+        
+        self._render_thread = threading.Thread(target=self._render_loop, daemon=True)
+        self._render_thread.start()
+    
+    def _refresh_style_cache(self):
+        """Snapshot theme styles so renders don't re-resolve them per cell."""
+        self._style_panel = self.theme.get_panel_style()
+        self._style_title = self.theme.get_title_style()
+        self._style_info = self.theme.get_info_style()
+        self._style_success = self.theme.get_success_style()
+        self._style_warning = self.theme.get_warning_style()
+        self._style_error = self.theme.get_error_style()
+        self._style_smtp_outgoing = self.theme.get_smtp_outgoing_style()
+        self._style_smtp_incoming = self.theme.get_smtp_incoming_style()
+        self._style_smtp_error = self.theme.get_smtp_error_style()
+        
+        # Column specs and empty-state panels are static per theme, so build
+        # them here once instead of on every frame
+        self._net_cols = ("Hop", "IP Address", "Hostname", "RTT")
+        self._file_cols = ("Filename", "Size", "Generated")
+        self._empty_network_panel = Panel(
+            Text("Network analysis not yet performed.", style=self._style_info),
+            title="Network Path Analysis",
+            style=self._style_panel
+        )
+        self._empty_files_panel = Panel(
+            Text("No files generated yet.", style=self._style_info),
+            title="Generated Files",
+            style=self._style_panel
+        )
+        self._empty_stats_panel = Panel(
+            Text("No SMTP statistics available.", style=self._style_info),
+            title="SMTP Statistics",
+            style=self._style_panel
+        )
+        self._empty_imap_panel = Panel(
+            Text("IMAP data not loaded yet.", style=self._style_info),
+            title="IMAP - Folders & Inbox",
+            style=self._style_panel
+        )
+    
+    def _new_table(self, columns, title: Optional[str] = None) -> Table:
+        """Build a header table from a cached column spec."""
+        table = Table(show_header=True, header_style=self._style_title, title=title)
+        for name in columns:
+            table.add_column(name, style=self._style_info)
+        return table
+    
+    def _mark_dirty(self, *panels: str):
+        """Flag panels for rebuild on the next update_display call."""
+        with self._dirty_lock:
+            for panel in panels:
+                self._dirty[panel] = True
+
+    @property
+    def is_dirty(self) -> bool:
+        """True if any panel changed since the last render."""
+        with self._dirty_lock:
+            return any(self._dirty.values())
+    
+    def _render_loop(self):
+        """Rebuild dirty panels at render_hz; Live picks up the layout."""
+        while True:
+            time.sleep(1.0 / self.render_hz)
+            try:
+                if any(self._dirty.values()):
+                    self.update_display()
+            except Exception:
+                # A failed render must not kill the loop for the rest of
+                # the session; re-flag every panel so the next tick
+                # rebuilds cleanly (update_display may have cleared some
+                # dirty flags before raising)
+                self._mark_dirty(*self._PANELS)
     
     def _setup_layout(self):
         """Setup the dashboard layout."""
@@ -73,30 +165,40 @@ class Dashboard:
     
     def add_smtp_log_entry(self, entry: SMTPLogEntry):
         """Add a new SMTP log entry."""
+        # Format the timestamp once at ingestion; the render path would
+        # otherwise redo the same strftime for every entry on every frame
+        entry._formatted_ts = datetime.fromtimestamp(entry.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        entry._rendered = self._render_log_entry(entry)
+        
+        # The deque's maxlen drops the oldest entry automatically
         self.smtp_log.append(entry)
-        # Keep only last 50 entries
-        if len(self.smtp_log) > 50:
-            self.smtp_log.pop(0)
+        self._mark_dirty("smtp_log")
     
     def update_network_analysis(self, network_path: NetworkPath):
         """Update network analysis results."""
         self.network_analysis = network_path
+        self._mark_dirty("network_analysis")
     
     def update_isp_analysis(self, isp_analysis: ISPAnalysis):
         """Update ISP analysis results."""
         self.isp_analysis = isp_analysis
+        self._mark_dirty("network_analysis")
     
     def update_port_scan(self, results: List[PortScanResult]):
         """Update port scan results."""
-        self.port_scan_results = results
+        self.port_scan_results.clear()
+        self.port_scan_results.extend(results)
+        self._mark_dirty("network_analysis")
     
     def update_stats(self, stats: SMTPStats):
         """Update SMTP statistics."""
         self.current_stats = stats
+        self._mark_dirty("statistics")
     
     def add_generated_file(self, file_info: FileInfo):
         """Add a generated file to the list."""
         self.generated_files.append(file_info)
+        self._mark_dirty("file_management")
     
     def update_imap_data(self, folders: List[IMAPFolder], messages: List[EmailMessage]):
         """Update IMAP folder and message data."""
@@ -106,62 +208,66 @@ class Dashboard:
     def _create_header(self) -> Panel:
         """Create the header panel."""
         title = Text("Email Investigation Tool - SMTP Debugger & ISP Analysis", 
-                    style=self.theme.get_title_style())
+                    style=self._style_title)
         
         theme_indicator = f"Theme: {self.theme.current_theme_name.title()} (Press 'T' to toggle)"
         
         header_text = Align.center(title)
-        theme_text = Text(theme_indicator, style=self.theme.get_info_style())
+        theme_text = Text(theme_indicator, style=self._style_info)
         
         return Panel(
             Align.center(title),
-            style=self.theme.get_panel_style(),
+            style=self._style_panel,
             height=3
         )
     
-    def _create_smtp_log_panel(self) -> Panel:
-        """Create the SMTP protocol log panel."""
-        log_text = Text()
+    def _render_log_entry(self, entry: SMTPLogEntry) -> Text:
+        """Build the styled Text fragment for a log entry."""
+        if entry.is_error:
+            style = self._style_smtp_error
+        elif entry.direction == "→":
+            style = self._style_smtp_outgoing
+        else:
+            style = self._style_smtp_incoming
         
-        # Show last 20 log entries
-        recent_logs = self.smtp_log[-20:] if len(self.smtp_log) > 20 else self.smtp_log
+        timing_info = f" ({entry.timing_info})" if entry.timing_info else ""
+        log_line = f"[{entry._formatted_ts}] {entry.direction} {entry.data_str}{timing_info}"
         
-        for entry in recent_logs:
-            timestamp = datetime.fromtimestamp(entry.timestamp).strftime("%H:%M:%S.%f")[:-3]
-            
-            if entry.is_error:
-                style = self.theme.get_smtp_error_style()
-            elif entry.direction == "→":
-                style = self.theme.get_smtp_outgoing_style()
-            else:
-                style = self.theme.get_smtp_incoming_style()
-            
-            timing_info = f" ({entry.timing_info})" if entry.timing_info else ""
-            log_line = f"[{timestamp}] {entry.direction} {entry.data}{timing_info}\\n"
-            
-            log_text.append(log_line, style=style)
+        return Text(log_line, style=style)
+    
+    def _create_smtp_log_panel(self) -> Panel:
+        """Create the SMTP protocol log panel."""
+        # One grid row per entry: Rich lays rows out independently, so
+        # unchanged rows don't force a re-flow of the whole log text
+        log_grid = Table.grid(expand=True)
+        log_grid.add_column()
         
-        if not recent_logs:
-            log_text.append("No SMTP activity yet. Connect to start logging.", 
-                          style=self.theme.get_info_style())
+        # Snapshot the deque before iterating: the SMTP callback thread
+        # appends concurrently, and iterating a deque while it mutates
+        # raises RuntimeError
+        entries = list(self.smtp_log)
+        count = len(entries)
+
+        # Entries are immutable, so reuse the fragments rendered at ingestion
+        for entry in islice(entries, max(0, count - 20), None):
+            log_grid.add_row(entry._rendered)
+
+        if not count:
+            log_grid.add_row(Text("No SMTP activity yet. Connect to start logging.", 
+                                  style=self._style_info))
         
         return Panel(
-            log_text,
+            log_grid,
             title="SMTP Protocol Log",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_network_analysis_panel(self) -> Panel:
         """Create the network analysis panel."""
         if not self.network_analysis:
-            content = Text("Network analysis not yet performed.", 
-                         style=self.theme.get_info_style())
+            return self._empty_network_panel
         else:
-            table = Table(show_header=True, header_style=self.theme.get_title_style())
-            table.add_column("Hop", style=self.theme.get_info_style())
-            table.add_column("IP Address", style=self.theme.get_info_style())
-            table.add_column("Hostname", style=self.theme.get_info_style())
-            table.add_column("RTT", style=self.theme.get_info_style())
+            table = self._new_table(self._net_cols)
             
             for hop in self.network_analysis.hops[-10:]:  # Show last 10 hops
                 hostname = hop.hostname if hop.hostname else "N/A"
@@ -174,32 +280,30 @@ class Dashboard:
                     rtt
                 )
             
-            # Add summary
-            summary = Text()
-            summary.append(f"Total hops: {self.network_analysis.total_hops}  ", 
-                         style=self.theme.get_info_style())
-            summary.append(f"Packet loss: {self.network_analysis.packet_loss:.1f}%  ", 
-                         style=self.theme.get_warning_style() if self.network_analysis.packet_loss > 5 else self.theme.get_success_style())
-            summary.append(f"Avg RTT: {self.network_analysis.avg_rtt:.1f}ms\\n", 
-                         style=self.theme.get_info_style())
-            
+            # Add summary in one assemble pass
+            parts = [
+                (f"Total hops: {self.network_analysis.total_hops}  ", self._style_info),
+                (f"Packet loss: {self.network_analysis.packet_loss:.1f}%  ",
+                 self._style_warning if self.network_analysis.packet_loss > 5 else self._style_success),
+                (f"Avg RTT: {self.network_analysis.avg_rtt:.1f}ms\\n", self._style_info),
+            ]
             if self.network_analysis.isp_detected:
-                summary.append(f"ISP: {self.network_analysis.isp_detected}\\n", 
-                             style=self.theme.get_warning_style())
+                parts.append((f"ISP: {self.network_analysis.isp_detected}\\n", self._style_warning))
+            summary = Text.assemble(*parts)
             
             content = Columns([table, summary])
         
         return Panel(
             content,
             title="Network Path Analysis",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_email_composition_panel(self) -> Panel:
         """Create the email composition panel."""
         table = Table(show_header=False, box=None, padding=(0, 1))
-        table.add_column("Label", style=self.theme.get_info_style())
-        table.add_column("Value", style=self.theme.get_info_style())
+        table.add_column("Label", style=self._style_info)
+        table.add_column("Value", style=self._style_info)
         
         table.add_row("To:", self.email_to or "[Enter recipient]")
         table.add_row("From:", self.email_from or "[Enter sender]")
@@ -215,20 +319,18 @@ class Dashboard:
         return Panel(
             table,
             title="Email Composition",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_file_management_panel(self) -> Panel:
         """Create the file management panel."""
         if not self.generated_files:
-            content = Text("No files generated yet.", style=self.theme.get_info_style())
+            return self._empty_files_panel
         else:
-            table = Table(show_header=True, header_style=self.theme.get_title_style())
-            table.add_column("Filename", style=self.theme.get_info_style())
-            table.add_column("Size", style=self.theme.get_info_style())
-            table.add_column("Generated", style=self.theme.get_info_style())
+            table = self._new_table(self._file_cols)
             
-            for file_info in self.generated_files[-5:]:  # Show last 5 files
+            recent_files = list(islice(self.generated_files, max(0, len(self.generated_files) - 5), None))
+            for file_info in recent_files:  # Show last 5 files
                 size_str = f"{file_info.size / (1024*1024):.1f} MB"
                 gen_time = f"{file_info.generation_time:.1f}s"
                 
@@ -243,25 +345,21 @@ class Dashboard:
         return Panel(
             content,
             title="Generated Files",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_imap_info_panel(self) -> Panel:
         """Create the IMAP folder and inbox info panel."""
         if not self.imap_folders and not self.inbox_messages:
-            content = Text("IMAP data not loaded yet.", style=self.theme.get_info_style())
+            return self._empty_imap_panel
         else:
             # Create two columns: folders and inbox
-            folders_table = Table(show_header=True, header_style=self.theme.get_title_style(), title="Folders")
-            folders_table.add_column("Name", style=self.theme.get_info_style())
-            folders_table.add_column("Count", style=self.theme.get_info_style())
+            folders_table = self._new_table(("Name", "Count"), title="Folders")
             
             for folder in self.imap_folders[:5]:  # Show first 5 folders
                 folders_table.add_row(folder.name, str(folder.message_count))
             
-            inbox_table = Table(show_header=True, header_style=self.theme.get_title_style(), title="Recent Inbox")
-            inbox_table.add_column("From", style=self.theme.get_info_style())
-            inbox_table.add_column("Subject", style=self.theme.get_info_style())
+            inbox_table = self._new_table(("From", "Subject"), title="Recent Inbox")
             
             for msg in self.inbox_messages[:5]:  # Show first 5 messages
                 subject = msg.subject[:30] + "..." if len(msg.subject) > 30 else msg.subject
@@ -273,17 +371,17 @@ class Dashboard:
         return Panel(
             content,
             title="IMAP - Folders & Inbox",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_statistics_panel(self) -> Panel:
         """Create the statistics panel."""
         if not self.current_stats:
-            content = Text("No SMTP statistics available.", style=self.theme.get_info_style())
+            return self._empty_stats_panel
         else:
             table = Table(show_header=False, box=None)
-            table.add_column("Metric", style=self.theme.get_info_style())
-            table.add_column("Value", style=self.theme.get_success_style())
+            table.add_column("Metric", style=self._style_info)
+            table.add_column("Value", style=self._style_success)
             
             table.add_row("Connection Time:", f"{self.current_stats.connection_time:.3f}s")
             table.add_row("Auth Time:", f"{self.current_stats.auth_time:.3f}s")
@@ -311,7 +409,7 @@ class Dashboard:
                 if self.network_monitor.stats.suspicious_connections > 0:
                     table.add_row("- Suspicious:", 
                                 str(self.network_monitor.stats.suspicious_connections),
-                                style=self.theme.get_error_style())
+                                style=self._style_error)
                 else:
                     table.add_row("- Suspicious:", "0")
             
@@ -320,39 +418,50 @@ class Dashboard:
         return Panel(
             content,
             title="SMTP Statistics",
-            style=self.theme.get_panel_style()
+            style=self._style_panel
         )
     
     def _create_footer(self) -> Panel:
         """Create the footer panel."""
-        controls = Text()
-        controls.append("Controls: ", style=self.theme.get_info_style())
-        controls.append("T", style=self.theme.get_success_style())
-        controls.append("=Toggle Theme  ", style=self.theme.get_info_style())
-        controls.append("Q", style=self.theme.get_success_style())
-        controls.append("=Quit  ", style=self.theme.get_info_style())
-        controls.append("S", style=self.theme.get_success_style())
-        controls.append("=Send Email  ", style=self.theme.get_info_style())
-        controls.append("G", style=self.theme.get_success_style())
-        controls.append("=Generate File  ", style=self.theme.get_info_style())
-        controls.append("I", style=self.theme.get_success_style())
-        controls.append("=Reload IMAP", style=self.theme.get_info_style())
+        # Single-pass assemble instead of a dozen append calls per frame
+        controls = Text.assemble(
+            ("Controls: ", self._style_info),
+            ("T", self._style_success),
+            ("=Toggle Theme  ", self._style_info),
+            ("Q", self._style_success),
+            ("=Quit  ", self._style_info),
+            ("S", self._style_success),
+            ("=Send Email  ", self._style_info),
+            ("G", self._style_success),
+            ("=Generate File  ", self._style_info),
+            ("I", self._style_success),
+            ("=Reload IMAP", self._style_info),
+        )
         
         return Panel(
             Align.center(controls),
-            style=self.theme.get_panel_style(),
+            style=self._style_panel,
             height=3
         )
     
     def update_display(self):
-        """Update all dashboard panels."""
-        self.layout["header"].update(self._create_header())
-        self.layout["smtp_log"].update(self._create_smtp_log_panel())
-        self.layout["network_analysis"].update(self._create_network_analysis_panel())
-        self.layout["email_composition"].update(self._create_email_composition_panel())
-        self.layout["file_management"].update(self._create_file_management_panel())
-        self.layout["statistics"].update(self._create_statistics_panel())
-        self.layout["footer"].update(self._create_footer())
+        """Rebuild dashboard panels whose data changed since the last call."""
+        builders = {
+            "header": self._create_header,
+            "smtp_log": self._create_smtp_log_panel,
+            "network_analysis": self._create_network_analysis_panel,
+            "email_composition": self._create_email_composition_panel,
+            "file_management": self._create_file_management_panel,
+            "statistics": self._create_statistics_panel,
+            "footer": self._create_footer,
+        }
+        with self._dirty_lock:
+            to_build = [panel for panel in self._PANELS if self._dirty[panel]]
+            for panel in to_build:
+                self._dirty[panel] = False
+        
+        for panel in to_build:
+            self.layout[panel].update(builders[panel]())
     
     def render(self) -> Layout:
         """Render the complete dashboard."""
@@ -362,7 +471,14 @@ class Dashboard:
     def toggle_theme(self):
         """Toggle between light and dark themes."""
         self.theme.toggle_theme()
+        self._refresh_style_cache()
         self.console = Console(theme=self.theme.rich_theme)
+        # Cached log fragments carry the old theme's styles; rebuild
+        # them from a snapshot in case the callback thread appends
+        for entry in list(self.smtp_log):
+            entry._rendered = self._render_log_entry(entry)
+        # Everything is styled, so a theme change invalidates every panel
+        self._mark_dirty(*self._PANELS)
     
     def set_email_field(self, field: str, value: str):
         """Set email composition field."""
@@ -374,10 +490,12 @@ class Dashboard:
             self.email_subject = value
         elif field == "attachment":
             self.selected_attachment = value
+        self._mark_dirty("email_composition")
     
     def toggle_gpg_option(self, option: str):
         """Toggle GPG options."""
         if option == "sign":
             self.gpg_sign = not self.gpg_sign
         elif option == "encrypt":
-            self.gpg_encrypt = not self.gpg_encrypt
\ No newline at end of file
+            self.gpg_encrypt = not self.gpg_encrypt
+        self._mark_dirty("email_composition")
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import subprocess
 import tempfile
+import threading
 import os
 import time
 from typing import Optional, List, Tuple
@@ -10,12 +11,16 @@ import gnupg
 
 @dataclass
 class GPGStatus:
-    """GPG availability and configuration status."""
+    """GPG availability and configuration status.
+
+    Key lists hold structured (keyid_short, uid) tuples; use
+    GPGManager.formatted_private_keys for display strings.
+    """
     available: bool
     version: str
-    private_keys: List[str]
-    public_keys: List[str]
-    default_key: Optional[str]
+    private_keys: List[Tuple[str, str]]
+    public_keys: List[Tuple[str, str]]
+    default_key: Optional[Tuple[str, str]]
     error_message: Optional[str] = None
 
 @dataclass
@@ -27,6 +32,7 @@ class GPGOperation:
     operation_time: float
     overhead_percent: float
     error_message: Optional[str] = None
+    processed_data: Optional[bytes] = None
 
 class GPGManager:
     """Manages GPG operations for email signing and encryption."""
@@ -34,46 +40,56 @@ class GPGManager:
     def __init__(self):
         self.gpg: Optional[gnupg.GPG] = None
         self.status: Optional[GPGStatus] = None
+        # Serializes operations sharing the warm agent session
+        self._gpg_lock = threading.Lock()
+        # Resolved once per (re)initialization so signing calls don't
+        # re-split the key list on every operation
+        self._default_sign_keyid: Optional[str] = None
+        # Availability collapsed to one boolean so the hot-path guard is a
+        # single attribute load instead of a two-step status chain
+        self._available = False
         self._initialize_gpg()
     
     def _initialize_gpg(self):
         """Initialize GPG and check availability."""
+        self._default_sign_keyid = None
+        self._available = False
         try:
-            # Check if GPG command is available
-            result = subprocess.run(['gpg', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                version_line = result.stdout.split('\\n')[0]
-                version = version_line.split()[-1] if version_line else "Unknown"
-                
-                # Initialize python-gnupg
-                self.gpg = gnupg.GPG()
-                
-                # Get key information
-                private_keys = self._get_private_keys()
-                public_keys = self._get_public_keys()
-                
-                default_key = private_keys[0] if private_keys else None
-                
-                self.status = GPGStatus(
-                    available=True,
-                    version=version,
-                    private_keys=private_keys,
-                    public_keys=public_keys,
-                    default_key=default_key
-                )
-            else:
-                self.status = GPGStatus(
-                    available=False,
-                    version="",
-                    private_keys=[],
-                    public_keys=[],
-                    default_key=None,
-                    error_message="GPG command failed"
-                )
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
+            # Initialize python-gnupg directly: its constructor already
+            # probes gpg once for the version, so running our own
+            # subprocess check first just doubled the fork+exec on cold
+            # start. use_agent routes private-key operations through the
+            # long-lived gpg-agent, so keyring and passphrase state is
+            # loaded once instead of per call. --no-auto-check-trustdb
+            # skips the web-of-trust recomputation gpg otherwise schedules
+            # on keyring reads, which dominates on large keyrings.
+            self.gpg = gnupg.GPG(use_agent=True,
+                                 options=['--no-auto-check-trustdb'])
+            version = ('.'.join(map(str, self.gpg.version))
+                       if self.gpg.version else "Unknown")
+            self._warm_agent()
+
+            # Key lists are scanned once here and cached on the status;
+            # refresh_status() re-runs this scan when callers need fresh
+            # keyring state.
+            private_keys = self._get_private_keys()
+            public_keys = self._get_public_keys()
+
+            default_key = private_keys[0] if private_keys else None
+            self._default_sign_keyid = (
+                private_keys[0][0] if private_keys else None
+            )
+
+            self.status = GPGStatus(
+                available=True,
+                version=version,
+                private_keys=private_keys,
+                public_keys=public_keys,
+                default_key=default_key
+            )
+            self._available = True
+
+        except (OSError, ValueError, Exception) as e:
             self.status = GPGStatus(
                 available=False,
                 version="",
@@ -83,31 +99,75 @@ class GPGManager:
                 error_message=f"GPG not available: {str(e)}"
             )
     
-    def _get_private_keys(self) -> List[str]:
-        """Get list of available private keys."""
+    def _warm_agent(self):
+        """Start gpg-agent up front so the first crypto call doesn't pay for it.
+
+        The agent is the long-lived session: once launched it keeps the
+        keyring and any cached passphrases resident, so every subsequent
+        sign/encrypt is a short-lived gpg client talking to a warm daemon
+        instead of a cold start.
+        """
+        try:
+            subprocess.run(['gpg-connect-agent', '--quiet', '/bye'],
+                           capture_output=True, timeout=10)
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            # No agent available; gpg falls back to spawning one on demand
+            pass
+
+    def _get_private_keys(self) -> List[Tuple[str, str]]:
+        """Get list of available private keys as (keyid_short, uid) tuples."""
         if not self.gpg:
             return []
-        
+
         try:
             keys = self.gpg.list_keys(True)  # True for private keys
-            return [f"{key['keyid'][-8:]} ({key['uids'][0]})" for key in keys if key['uids']]
+            return [(key['keyid'][-8:], key['uids'][0]) for key in keys if key['uids']]
         except Exception:
             return []
-    
-    def _get_public_keys(self) -> List[str]:
-        """Get list of available public keys."""
+
+    def _get_public_keys(self) -> List[Tuple[str, str]]:
+        """Get list of available public keys as (keyid_short, uid) tuples."""
         if not self.gpg:
             return []
-        
+
         try:
             keys = self.gpg.list_keys()
-            return [f"{key['keyid'][-8:]} ({key['uids'][0]})" for key in keys if key['uids']]
+            return [(key['keyid'][-8:], key['uids'][0]) for key in keys if key['uids']]
         except Exception:
             return []
+
+    def _run_gpg(self, args: List[str], data: bytes) -> Tuple[bytes, bytes, int]:
+        """Run gpg directly, feeding data over stdin in one shot.
+
+        python-gnupg pumps stdin/stdout through helper threads whose lock
+        traffic dominates profiles for bulk payloads; a plain Popen with
+        communicate() moves the same bytes with zero Python-level
+        synchronization. The warm agent still serves the key material.
+        """
+        cmd = ['gpg', '--batch', '--yes', '--no-tty',
+               '--no-auto-check-trustdb'] + args
+        with self._gpg_lock:
+            proc = subprocess.Popen(cmd,
+                                    stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            out, err = proc.communicate(data)
+        return out, err, proc.returncode
+
+    @property
+    def formatted_private_keys(self) -> List[str]:
+        """Private keys rendered as display strings, formatted on demand.
+
+        Keys are stored structured so the signing path never has to parse
+        a keyid back out of a formatted string.
+        """
+        if not self.status:
+            return []
+        return [f"{keyid} ({uid})" for keyid, uid in self.status.private_keys]
     
     def sign_data(self, data: bytes, key_id: Optional[str] = None) -> GPGOperation:
         """Sign data with GPG."""
-        if not self.status or not self.status.available:
+        if not self._available:
             return GPGOperation(
                 success=False,
                 original_size=len(data),
@@ -117,20 +177,24 @@ class GPGManager:
                 error_message="GPG not available"
             )
         
-        start_time = time.time()
+        now = time.perf_counter
+        start_time = now()
         original_size = len(data)
         
         try:
             # Use default key if none specified
-            if key_id is None and self.status.private_keys:
-                key_id = self.status.private_keys[0].split()[0]
+            if key_id is None:
+                key_id = self._default_sign_keyid
             
             # Sign the data
-            signed = self.gpg.sign(data, keyid=key_id, detach=False)
-            
-            if signed.data:
-                processed_size = len(signed.data)
-                operation_time = time.time() - start_time
+            args = ['--clearsign', '--output', '-']
+            if key_id:
+                args += ['--local-user', key_id]
+            out, err, returncode = self._run_gpg(args, data)
+
+            if returncode == 0 and out:
+                processed_size = len(out)
+                operation_time = now() - start_time
                 overhead_percent = ((processed_size / original_size) - 1) * 100
                 
                 return GPGOperation(
@@ -138,16 +202,17 @@ class GPGManager:
                     original_size=original_size,
                     processed_size=processed_size,
                     operation_time=operation_time,
-                    overhead_percent=overhead_percent
+                    overhead_percent=overhead_percent,
+                    processed_data=out
                 )
             else:
                 return GPGOperation(
                     success=False,
                     original_size=original_size,
                     processed_size=0,
-                    operation_time=time.time() - start_time,
+                    operation_time=now() - start_time,
                     overhead_percent=0.0,
-                    error_message=f"Signing failed: {signed.stderr}"
+                    error_message=f"Signing failed: {err.decode('utf-8', errors='replace')}"
                 )
                 
         except Exception as e:
@@ -155,14 +220,14 @@ class GPGManager:
                 success=False,
                 original_size=original_size,
                 processed_size=0,
-                operation_time=time.time() - start_time,
+                operation_time=now() - start_time,
                 overhead_percent=0.0,
                 error_message=f"GPG sign error: {str(e)}"
             )
     
     def encrypt_data(self, data: bytes, recipients: List[str]) -> GPGOperation:
         """Encrypt data with GPG."""
-        if not self.status or not self.status.available:
+        if not self._available:
             return GPGOperation(
                 success=False,
                 original_size=len(data),
@@ -172,16 +237,21 @@ class GPGManager:
                 error_message="GPG not available"
             )
         
-        start_time = time.time()
+        now = time.perf_counter
+        start_time = now()
         original_size = len(data)
         
         try:
             # Encrypt the data
-            encrypted = self.gpg.encrypt(data, recipients, always_trust=True)
-            
-            if encrypted.data:
-                processed_size = len(encrypted.data)
-                operation_time = time.time() - start_time
+            args = ['--encrypt', '--armor', '--trust-model', 'always',
+                    '--output', '-']
+            for recipient in recipients:
+                args += ['--recipient', recipient]
+            out, err, returncode = self._run_gpg(args, data)
+
+            if returncode == 0 and out:
+                processed_size = len(out)
+                operation_time = now() - start_time
                 overhead_percent = ((processed_size / original_size) - 1) * 100
                 
                 return GPGOperation(
@@ -189,16 +259,17 @@ class GPGManager:
                     original_size=original_size,
                     processed_size=processed_size,
                     operation_time=operation_time,
-                    overhead_percent=overhead_percent
+                    overhead_percent=overhead_percent,
+                    processed_data=out
                 )
             else:
                 return GPGOperation(
                     success=False,
                     original_size=original_size,
                     processed_size=0,
-                    operation_time=time.time() - start_time,
+                    operation_time=now() - start_time,
                     overhead_percent=0.0,
-                    error_message=f"Encryption failed: {encrypted.stderr}"
+                    error_message=f"Encryption failed: {err.decode('utf-8', errors='replace')}"
                 )
                 
         except Exception as e:
@@ -206,7 +277,7 @@ class GPGManager:
                 success=False,
                 original_size=original_size,
                 processed_size=0,
-                operation_time=time.time() - start_time,
+                operation_time=now() - start_time,
                 overhead_percent=0.0,
                 error_message=f"GPG encrypt error: {str(e)}"
             )
@@ -214,7 +285,7 @@ class GPGManager:
     def sign_and_encrypt_data(self, data: bytes, recipients: List[str], 
                              sign_key: Optional[str] = None) -> GPGOperation:
         """Sign and encrypt data in one operation."""
-        if not self.status or not self.status.available:
+        if not self._available:
             return GPGOperation(
                 success=False,
                 original_size=len(data),
@@ -224,20 +295,27 @@ class GPGManager:
                 error_message="GPG not available"
             )
         
-        start_time = time.time()
+        now = time.perf_counter
+        start_time = now()
         original_size = len(data)
         
         try:
             # Use default key if none specified
-            if sign_key is None and self.status.private_keys:
-                sign_key = self.status.private_keys[0].split()[0]
+            if sign_key is None:
+                sign_key = self._default_sign_keyid
             
             # Sign and encrypt
-            result = self.gpg.encrypt(data, recipients, sign=sign_key, always_trust=True)
-            
-            if result.data:
-                processed_size = len(result.data)
-                operation_time = time.time() - start_time
+            args = ['--encrypt', '--sign', '--armor', '--trust-model', 'always',
+                    '--output', '-']
+            if sign_key:
+                args += ['--local-user', sign_key]
+            for recipient in recipients:
+                args += ['--recipient', recipient]
+            out, err, returncode = self._run_gpg(args, data)
+
+            if returncode == 0 and out:
+                processed_size = len(out)
+                operation_time = now() - start_time
                 overhead_percent = ((processed_size / original_size) - 1) * 100
                 
                 return GPGOperation(
@@ -245,16 +323,17 @@ class GPGManager:
                     original_size=original_size,
                     processed_size=processed_size,
                     operation_time=operation_time,
-                    overhead_percent=overhead_percent
+                    overhead_percent=overhead_percent,
+                    processed_data=out
                 )
             else:
                 return GPGOperation(
                     success=False,
                     original_size=original_size,
                     processed_size=0,
-                    operation_time=time.time() - start_time,
+                    operation_time=now() - start_time,
                     overhead_percent=0.0,
-                    error_message=f"Sign+encrypt failed: {result.stderr}"
+                    error_message=f"Sign+encrypt failed: {err.decode('utf-8', errors='replace')}"
                 )
                 
         except Exception as e:
@@ -262,28 +341,43 @@ class GPGManager:
                 success=False,
                 original_size=original_size,
                 processed_size=0,
-                operation_time=time.time() - start_time,
+                operation_time=now() - start_time,
                 overhead_percent=0.0,
                 error_message=f"GPG sign+encrypt error: {str(e)}"
             )
     
-    def process_email_content(self, email_content: str, sign: bool = False, 
+    def process_email_content(self, email_content, sign: bool = False,
                              encrypt: bool = False, recipients: List[str] = None,
-                             sign_key: Optional[str] = None) -> Tuple[str, GPGOperation]:
-        """Process email content with GPG operations."""
+                             sign_key: Optional[str] = None) -> Tuple[object, GPGOperation]:
+        """Process email content with GPG operations.
+
+        Accepts str or a bytes-like payload (bytes, bytearray, memoryview).
+        Bytes-like content goes to gpg as-is — no encode pass and no extra
+        copy of multi-MB attachment payloads; str results are decoded back
+        to str so str callers round-trip transparently.
+        """
+        is_str = isinstance(email_content, str)
+
         if not sign and not encrypt:
-            # No GPG processing needed
-            data_bytes = email_content.encode('utf-8')
+            # No GPG processing needed — pure pass-through, so don't pay
+            # for a full encode just to report a size. ASCII text (the
+            # common case for MIME output) is one byte per char; only
+            # non-ASCII content needs the real encode.
+            if is_str:
+                byte_size = (len(email_content) if email_content.isascii()
+                             else len(email_content.encode('utf-8')))
+            else:
+                byte_size = len(email_content)
             return email_content, GPGOperation(
                 success=True,
-                original_size=len(data_bytes),
-                processed_size=len(data_bytes),
+                original_size=byte_size,
+                processed_size=byte_size,
                 operation_time=0.0,
                 overhead_percent=0.0
             )
-        
-        data_bytes = email_content.encode('utf-8')
-        
+
+        data_bytes = email_content.encode('utf-8') if is_str else email_content
+
         if sign and encrypt:
             if not recipients:
                 return email_content, GPGOperation(
@@ -309,13 +403,34 @@ class GPGManager:
                 )
             operation = self.encrypt_data(data_bytes, recipients)
         
-        if operation.success and hasattr(self.gpg, 'encrypt'):
-            # Get the processed data (this is a simplified approach)
-            processed_content = email_content  # In real implementation, would use operation result
-            return processed_content, operation
+        if operation.success and operation.processed_data is not None:
+            # Return the actual signed/encrypted output so callers don't
+            # have to run GPG a second time over the same content
+            if is_str:
+                return operation.processed_data.decode('utf-8', errors='replace'), operation
+            return operation.processed_data, operation
         else:
             return email_content, operation
     
+    def process_batch(self, payloads: List[bytes], sign: bool = False,
+                      encrypt: bool = False, recipients: List[str] = None,
+                      sign_key: Optional[str] = None) -> List[GPGOperation]:
+        """Process several payloads back-to-back against the warm agent.
+
+        Only the first operation pays the agent handshake and keyring load;
+        the rest reuse the cached session, so batching N small payloads is
+        much cheaper than N independent cold calls.
+        """
+        results = []
+        for data in payloads:
+            if sign and encrypt:
+                results.append(self.sign_and_encrypt_data(data, recipients or [], sign_key))
+            elif encrypt:
+                results.append(self.encrypt_data(data, recipients or []))
+            else:
+                results.append(self.sign_data(data, sign_key))
+        return results
+
     def get_status_summary(self) -> str:
         """Get a human-readable status summary."""
         if not self.status:
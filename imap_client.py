@@ -2,11 +2,41 @@
 
 import imaplib
 import email
+import re
 import ssl
+import threading
 import time
-from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from email.header import decode_header
+from email.parser import BytesHeaderParser
+
+# STATUS untagged response: '"folder name" (MESSAGES 12)'
+_STATUS_RE = re.compile(r'"?(?P<name>[^"]+)"? \(MESSAGES (?P<count>\d+)\)')
+
+# LIST untagged response: '(\Flags) "delimiter" "folder name"' where the
+# name may also appear unquoted (e.g. INBOX). Matched as bytes straight off
+# the wire; only the name group gets decoded.
+_LIST_RE = re.compile(
+    rb'^\((?P<flags>[^)]*)\) "(?P<delim>[^"]*)" (?:"(?P<name>.*)"|(?P<raw>\S+))$'
+)
+
+# FETCH metadata prefix items, compiled once instead of per message. Bytes
+# patterns: the prefix is matched straight off the wire without decoding.
+_UID_RE = re.compile(rb'UID (\d+)')
+_SIZE_RE = re.compile(rb'RFC822\.SIZE (\d+)')
+_FLAGS_RE = re.compile(rb'FLAGS \(([^)]*)\)')
+
+# Messages per FETCH command when pipelining large ranges
+_FETCH_BATCH = 50
+
+# Shared TLS context: building one per connect re-parses the system CA
+# bundle every time, which is tens of milliseconds on reconnects.
+# _create_stdlib_context is exactly what IMAP4_SSL builds when no
+# context is passed — no certificate or hostname verification — so the
+# tool keeps working against the self-signed and intercepted endpoints
+# it exists to diagnose
+_SSL_CTX = ssl._create_stdlib_context()
 
 @dataclass
 class EmailMessage:
@@ -17,7 +47,25 @@ class EmailMessage:
     date: str
     size: int
     flags: List[str]
-    has_attachments: bool = False
+    content_type: Optional[str] = None
+    _has_attachments: Optional[bool] = field(default=None, init=False, repr=False)
+
+    @property
+    def has_attachments(self) -> bool:
+        """Attachment heuristic on Content-Type, computed on first access.
+
+        Most messages are listed without this ever being read, so the
+        check is deferred and cached rather than done during parsing.
+        """
+        if self._has_attachments is None:
+            content_type = self.content_type
+            # Short-circuit on the conventional lowercase form before
+            # paying for a lowered copy
+            self._has_attachments = bool(content_type) and (
+                'multipart/mixed' in content_type
+                or 'multipart/mixed' in content_type.lower()
+            )
+        return self._has_attachments
 
 @dataclass
 class IMAPFolder:
@@ -43,7 +91,15 @@ class IMAPStats:
 
 class IMAPClient:
     """Enhanced IMAP client for email folder and message analysis."""
-    
+
+    # Authenticated connections parked between uses, keyed by
+    # (host, port, username). Reusing one skips the TCP + TLS handshake
+    # and LOGIN round trips that otherwise precede every analysis pass.
+    _pool: Dict[Tuple[str, int, str], imaplib.IMAP4] = {}
+    _pool_lock = threading.Lock()
+    _keepalive_interval = 60.0
+    _keepalive_thread: Optional[threading.Thread] = None
+
     def __init__(self, host: str, port: int, use_ssl: bool = True):
         self.host = host
         self.port = port
@@ -52,20 +108,43 @@ class IMAPClient:
         self.stats = IMAPStats()
         self.folders: List[IMAPFolder] = []
         self.inbox_messages: List[EmailMessage] = []
-    
+        self._pool_key: Optional[Tuple[str, int, str]] = None
+
     def connect(self, username: str, password: str) -> bool:
-        """Connect to IMAP server and authenticate."""
+        """Connect to IMAP server and authenticate.
+
+        A pooled connection from an earlier disconnect is revalidated with
+        NOOP and reused when possible; only a miss (or a stale pooled
+        connection) pays for a fresh handshake and login.
+        """
         start_time = time.time()
-        
+        key = (self.host, self.port, username)
+
+        with IMAPClient._pool_lock:
+            pooled = IMAPClient._pool.pop(key, None)
+        if pooled is not None:
+            try:
+                pooled.noop()
+                self.connection = pooled
+                self._pool_key = key
+                self.stats.connection_time = time.time() - start_time
+                return True
+            except Exception:
+                # Stale (server idle-timeout, dropped link); fall through
+                # to a fresh connect
+                pass
+
         try:
             if self.use_ssl:
-                self.connection = imaplib.IMAP4_SSL(self.host, self.port)
+                self.connection = imaplib.IMAP4_SSL(self.host, self.port,
+                                                    ssl_context=_SSL_CTX)
             else:
                 self.connection = imaplib.IMAP4(self.host, self.port)
             
             # Authenticate
             self.connection.login(username, password)
-            
+
+            self._pool_key = key
             self.stats.connection_time = time.time() - start_time
             return True
             
@@ -85,67 +164,126 @@ class IMAPClient:
         try:
             # List all folders
             status, folder_list = self.connection.list()
-            
+
             if status == 'OK':
+                parsed = []
+                # imaplib always yields LIST lines as bytes (or None for
+                # empty mailboxes), so one falsiness check covers it — no
+                # per-line type dispatch
                 for folder_info in folder_list:
-                    if isinstance(folder_info, bytes):
-                        folder_str = folder_info.decode('utf-8')
-                    else:
-                        folder_str = folder_info
-                    
-                    # Parse folder information
-                    # Format: (flags) "delimiter" "folder_name"
-                    parts = folder_str.split('"')
-                    if len(parts) >= 3:
-                        flags_part = parts[0].strip('() ')
-                        delimiter = parts[1] if len(parts) > 1 else "/"
-                        folder_name = parts[-1] if len(parts) > 2 else "Unknown"
-                        
-                        flags = [f.strip() for f in flags_part.split() if f.strip()]
-                        
-                        # Get message count for this folder
-                        message_count = self._get_folder_message_count(folder_name)
-                        
-                        folder = IMAPFolder(
-                            name=folder_name,
-                            flags=flags,
-                            message_count=message_count,
-                            delimiter=delimiter
-                        )
-                        folders.append(folder)
-            
+                    if not folder_info:
+                        continue
+
+                    # One regex pass over the raw bytes instead of decoding
+                    # the whole line and split('"')-ing it, which also broke
+                    # on quoted names
+                    match = _LIST_RE.match(folder_info)
+                    if match:
+                        name_bytes = match.group('name')
+                        if name_bytes is None:
+                            name_bytes = match.group('raw')
+                        folder_name = name_bytes.decode('utf-8', errors='replace')
+                        delimiter = match.group('delim').decode('utf-8', errors='replace')
+                        flags = match.group('flags').decode('utf-8', errors='replace').split()
+                        parsed.append((folder_name, flags, delimiter))
+
+                # One pipelined batch for all counts instead of a SELECT
+                # round trip per folder
+                counts = self._get_folder_message_counts([name for name, _, _ in parsed])
+
+                for folder_name, flags, delimiter in parsed:
+                    folder = IMAPFolder(
+                        name=folder_name,
+                        flags=flags,
+                        message_count=counts.get(folder_name, 0),
+                        delimiter=delimiter
+                    )
+                    folders.append(folder)
+
             self.folders = folders
             self.stats.folder_list_time = time.time() - start_time
             self.stats.total_folders = len(folders)
-            
+
         except Exception as e:
             self.stats.errors.append(f"Failed to list folders: {str(e)}")
-        
+
         return folders
-    
-    def _get_folder_message_count(self, folder_name: str) -> int:
-        """Get message count for a specific folder."""
+
+    def _get_folder_message_counts(self, folder_names: List[str]) -> Dict[str, int]:
+        """Get message counts for many folders with pipelined STATUS commands.
+
+        STATUS is stateless (no mailbox switch like SELECT), and sending every
+        command before reading any completion means N folders cost roughly one
+        round trip instead of N.
+        """
+        counts: Dict[str, int] = {}
+        if not folder_names:
+            return counts
+
         try:
-            status, messages = self.connection.select(folder_name, readonly=True)
-            if status == 'OK' and messages and messages[0]:
-                return int(messages[0])
-        except Exception:
-            pass
-        return 0
+            tags = []
+            for name in folder_names:
+                quoted = name if name.startswith('"') else f'"{name}"'
+                tags.append(self.connection._command('STATUS', quoted, '(MESSAGES)'))
+            for tag in tags:
+                self.connection._command_complete('STATUS', tag)
+
+            # response() echoes the code name ('STATUS'), not 'OK' —
+            # command success was already checked by _command_complete
+            _, responses = self.connection.response('STATUS')
+            for response in responses or []:
+                if response is None:
+                    continue
+                if isinstance(response, bytes):
+                    response = response.decode('utf-8', errors='ignore')
+                match = _STATUS_RE.match(response)
+                if match:
+                    counts[match.group('name')] = int(match.group('count'))
+        except Exception as e:
+            self.stats.errors.append(f"Failed to get folder counts: {str(e)}")
+
+        return counts
     
-    def fetch_inbox_messages(self, limit: int = 10) -> List[EmailMessage]:
-        """Fetch recent messages from inbox."""
+    def begin_inbox_select(self) -> Optional[str]:
+        """Issue SELECT INBOX without waiting for its completion.
+
+        Returns the command tag, which fetch_inbox_messages reaps via its
+        pending_select parameter. Starting the SELECT round trip early lets
+        it overlap other pipelined work (e.g. the folder STATUS batch).
+        """
+        if not self.connection:
+            return None
+        try:
+            return self.connection._command('SELECT', 'INBOX')
+        except Exception as e:
+            self.stats.errors.append(f"Failed to start INBOX select: {str(e)}")
+            return None
+
+    def fetch_inbox_messages(self, limit: int = 10,
+                             pending_select: Optional[str] = None) -> List[EmailMessage]:
+        """Fetch recent messages from inbox.
+
+        If pending_select holds a tag from begin_inbox_select, the already
+        in-flight SELECT is completed instead of issuing a fresh one.
+        """
         if not self.connection:
             self.stats.errors.append("Not connected to IMAP server")
             return []
-        
+
         start_time = time.time()
         messages = []
-        
+
         try:
-            # Select inbox
-            status, message_count = self.connection.select('INBOX')
-            
+            # Select inbox (or reap the pipelined SELECT)
+            if pending_select is not None:
+                status, message_count = self.connection._command_complete(
+                    'SELECT', pending_select)
+                if status == 'OK':
+                    self.connection.state = 'SELECTED'
+                    _, message_count = self.connection.response('EXISTS')
+            else:
+                status, message_count = self.connection.select('INBOX')
+
             if status == 'OK' and message_count and message_count[0]:
                 total_messages = int(message_count[0])
                 self.stats.total_messages = total_messages
@@ -155,17 +293,16 @@ class IMAPClient:
                 end_idx = total_messages
                 
                 if start_idx <= end_idx:
-                    # Fetch message UIDs and basic info
-                    status, msg_data = self.connection.fetch(
-                        f'{start_idx}:{end_idx}',
-                        '(UID ENVELOPE RFC822.SIZE FLAGS BODYSTRUCTURE)'
+                    # Targeted fetch: just the headers we display plus the
+                    # metadata items, instead of the whole envelope blob.
+                    # Messages are parsed batch by batch as responses are
+                    # reaped rather than accumulated first.
+                    self._fetch_pipelined(
+                        start_idx, end_idx,
+                        '(UID FLAGS RFC822.SIZE '
+                        'BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE CONTENT-TYPE)])',
+                        lambda part: self._parse_message_response(part, messages)
                     )
-                    
-                    if status == 'OK':
-                        # Parse messages (simplified parsing)
-                        for response_part in msg_data:
-                            if isinstance(response_part, tuple):
-                                self._parse_message_response(response_part, messages)
             
             self.inbox_messages = messages
             self.stats.message_fetch_time = time.time() - start_time
@@ -175,26 +312,55 @@ class IMAPClient:
         
         return messages
     
+    def _fetch_pipelined(self, start_idx: int, end_idx: int, spec: str,
+                         handler) -> None:
+        """FETCH a sequence range in pipelined _FETCH_BATCH-sized commands.
+
+        All subrange commands go out before any completion is read, the same
+        trick _get_folder_message_counts uses for STATUS: on a high-RTT link
+        a large range costs roughly one round trip instead of one per batch.
+
+        handler is called with each tuple response part as its batch is
+        reaped, and the batch data is released right after — peak memory is
+        one batch rather than the whole range, and parsing overlaps the
+        arrival of later batches on the socket.
+        """
+        tags = []
+        for lo in range(start_idx, end_idx + 1, _FETCH_BATCH):
+            hi = min(lo + _FETCH_BATCH - 1, end_idx)
+            tags.append(self.connection._command('FETCH', f'{lo}:{hi}', spec))
+
+        for tag in tags:
+            self.connection._command_complete('FETCH', tag)
+            # Responses arrive in command order, so popping FETCH here
+            # yields exactly this batch's data. Bare b')' parts are just
+            # the closing parens of literal responses.
+            typ, data = self.connection.response('FETCH')
+            for part in data or []:
+                if isinstance(part, tuple):
+                    handler(part)
+
     def _parse_message_response(self, response_part: tuple, messages: List[EmailMessage]):
         """Parse a single message response."""
         try:
             if len(response_part) >= 2:
+                # Element 0 is the IMAP metadata prefix (UID/FLAGS/SIZE),
+                # element 1 the literal with the requested header fields.
+                # imaplib hands both over as bytes, and the extractors match
+                # bytes patterns, so no type dispatch or decode is needed.
+                prefix = response_part[0]
                 header_data = response_part[1]
-                if isinstance(header_data, bytes):
-                    header_str = header_data.decode('utf-8', errors='ignore')
-                else:
-                    header_str = str(header_data)
-                
-                # This is a simplified parser - in a real implementation,
-                # you'd want to use proper IMAP response parsing
-                uid = self._extract_uid(header_str)
-                subject = self._extract_subject(header_str)
-                sender = self._extract_sender(header_str)
-                date = self._extract_date(header_str)
-                size = self._extract_size(header_str)
-                flags = self._extract_flags(header_str)
-                has_attachments = self._check_attachments(header_str)
-                
+
+                uid = self._extract_uid(prefix)
+                size = self._extract_size(prefix)
+                flags = self._extract_flags(prefix)
+
+                # One linear header parse instead of regex scans over the blob
+                headers = BytesHeaderParser().parsebytes(header_data)
+                subject = self._decode_header_value(headers.get('Subject')) or "No subject"
+                sender = self._decode_header_value(headers.get('From')) or "Unknown sender"
+                date = headers.get('Date') or "Recent"
+
                 message = EmailMessage(
                     uid=uid,
                     subject=subject,
@@ -202,58 +368,44 @@ class IMAPClient:
                     date=date,
                     size=size,
                     flags=flags,
-                    has_attachments=has_attachments
+                    content_type=headers.get('Content-Type')
                 )
                 messages.append(message)
                 
         except Exception as e:
             self.stats.errors.append(f"Failed to parse message: {str(e)}")
     
-    def _extract_uid(self, header_str: str) -> str:
-        """Extract UID from header string."""
-        # Simplified UID extraction
-        import re
-        uid_match = re.search(r'UID (\d+)', header_str)
-        return uid_match.group(1) if uid_match else "unknown"
-    
-    def _extract_subject(self, header_str: str) -> str:
-        """Extract subject from header string."""
-        # Simplified subject extraction
-        import re
-        subject_match = re.search(r'ENVELOPE.*?"([^"]*)"', header_str)
-        return subject_match.group(1) if subject_match else "No subject"
-    
-    def _extract_sender(self, header_str: str) -> str:
-        """Extract sender from header string."""
-        # Simplified sender extraction
-        import re
-        sender_match = re.search(r'ENVELOPE.*?"[^"]*".*?"([^"]*)"', header_str)
-        return sender_match.group(1) if sender_match else "Unknown sender"
+    def _extract_uid(self, header_bytes: bytes) -> str:
+        """Extract UID from the metadata prefix."""
+        uid_match = _UID_RE.search(header_bytes)
+        return uid_match.group(1).decode('ascii') if uid_match else "unknown"
     
-    def _extract_date(self, header_str: str) -> str:
-        """Extract date from header string."""
-        # Simplified date extraction
-        return "Recent"  # Would parse proper date in real implementation
-    
-    def _extract_size(self, header_str: str) -> int:
-        """Extract message size from header string."""
-        import re
-        size_match = re.search(r'RFC822\.SIZE (\d+)', header_str)
+    @staticmethod
+    def _decode_header_value(value: Optional[str]) -> Optional[str]:
+        """Decode an RFC 2047 header value into a readable string."""
+        if value is None:
+            return None
+        parts = []
+        for data, charset in decode_header(value):
+            if isinstance(data, bytes):
+                parts.append(data.decode(charset or 'utf-8', errors='replace'))
+            else:
+                parts.append(data)
+        return ''.join(parts)
+
+    def _extract_size(self, header_bytes: bytes) -> int:
+        """Extract message size from the metadata prefix."""
+        size_match = _SIZE_RE.search(header_bytes)
         return int(size_match.group(1)) if size_match else 0
-    
-    def _extract_flags(self, header_str: str) -> List[str]:
-        """Extract flags from header string."""
-        import re
-        flags_match = re.search(r'FLAGS \(([^)]*)\)', header_str)
+
+    def _extract_flags(self, header_bytes: bytes) -> List[str]:
+        """Extract flags from the metadata prefix."""
+        flags_match = _FLAGS_RE.search(header_bytes)
         if flags_match:
-            return flags_match.group(1).split()
+            return [flag.decode('ascii', errors='replace')
+                    for flag in flags_match.group(1).split()]
         return []
-    
-    def _check_attachments(self, header_str: str) -> bool:
-        """Check if message has attachments."""
-        # Simplified attachment detection
-        return 'BODYSTRUCTURE' in header_str and 'multipart' in header_str.lower()
-    
+
     def get_folder_by_name(self, name: str) -> Optional[IMAPFolder]:
         """Get folder by name."""
         for folder in self.folders:
@@ -261,14 +413,80 @@ class IMAPClient:
                 return folder
         return None
     
-    def disconnect(self):
-        """Disconnect from IMAP server."""
+    def disconnect(self, to_pool: bool = True):
+        """Disconnect from IMAP server.
+
+        By default the authenticated connection is parked in the class
+        pool for the next connect() with the same host/port/user; pass
+        to_pool=False to log out and tear it down for real.
+        """
         if self.connection:
+            if to_pool and self._pool_key is not None:
+                with IMAPClient._pool_lock:
+                    IMAPClient._pool[self._pool_key] = self.connection
+                IMAPClient._ensure_keepalive()
+            else:
+                try:
+                    self.connection.logout()
+                except Exception:
+                    pass
+            self.connection = None
+            self._pool_key = None
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Log out and drop every pooled connection (app shutdown)."""
+        with cls._pool_lock:
+            pooled = list(cls._pool.values())
+            cls._pool.clear()
+        for conn in pooled:
             try:
-                self.connection.logout()
+                conn.logout()
             except Exception:
                 pass
-            self.connection = None
+
+    @classmethod
+    def _ensure_keepalive(cls):
+        """Start the pool keep-alive thread if it isn't running yet."""
+        if cls._keepalive_thread is None or not cls._keepalive_thread.is_alive():
+            cls._keepalive_thread = threading.Thread(
+                target=cls._keepalive_loop, daemon=True)
+            cls._keepalive_thread.start()
+
+    @classmethod
+    def _keepalive_loop(cls):
+        """Ping pooled connections so servers don't idle-time them out.
+
+        Each connection is popped from the pool for the duration of its
+        NOOP so connect() can never borrow it mid-ping — imaplib
+        connections are not safe to share between threads. A healthy
+        connection goes back afterwards unless a newer one was parked
+        under the same key meanwhile, in which case ours is torn down
+        rather than overwriting it.
+        """
+        while True:
+            time.sleep(cls._keepalive_interval)
+            with cls._pool_lock:
+                keys = list(cls._pool)
+            for key in keys:
+                with cls._pool_lock:
+                    conn = cls._pool.pop(key, None)
+                if conn is None:
+                    # Borrowed by connect() since the snapshot
+                    continue
+                try:
+                    conn.noop()
+                except Exception:
+                    # Stale (server idle-timeout, dropped link); it is
+                    # already out of the pool, so just let it go
+                    continue
+                with cls._pool_lock:
+                    parked = cls._pool.setdefault(key, conn)
+                if parked is not conn:
+                    try:
+                        conn.logout()
+                    except Exception:
+                        pass
     
     def get_stats_summary(self) -> str:
         """Get a summary of IMAP statistics."""
@@ -291,15 +509,22 @@ class IMAPDebugger:
         
         if not success:
             return [], [], self.client.stats
-        
+
+        # Start the INBOX SELECT round trip now so it runs on the wire
+        # while the folder LIST/STATUS batch is in flight
+        pending_select = self.client.begin_inbox_select()
+
         # List folders
         folders = self.client.list_folders()
-        
-        # Fetch inbox messages
-        messages = self.client.fetch_inbox_messages(limit=10)
-        
+
+        # Fetch inbox messages, reaping the already-completed SELECT
+        messages = self.client.fetch_inbox_messages(limit=10,
+                                                    pending_select=pending_select)
+
         return folders, messages, self.client.stats
     
-    def disconnect(self):
-        """Disconnect from server."""
-        self.client.disconnect()
\ No newline at end of file
+    def disconnect(self, to_pool: bool = True):
+        """Disconnect from server (parked in the pool unless to_pool=False)."""
+        self.client.disconnect(to_pool=to_pool)
+        if not to_pool:
+            IMAPClient.shutdown_pool()
\ No newline at end of file
@@ -1,10 +1,15 @@
 """Email Investigation Tool - SMTP Debugger & ISP Analysis."""
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import termios
 import time
+import tty
 from pathlib import Path
 
 from rich.live import Live
@@ -23,15 +28,39 @@ from network_monitor import NetworkMonitor
 
 class EmailInvestigationTool:
     """Main application class."""
-    
+
+    # Recycle a pooled SMTP connection after this many sends; servers cap
+    # messages per session and a fresh AUTH now and then keeps us under it
+    SMTP_MAX_MESSAGES = 100
+
+    # How long a successful DNS resolution stays fresh between analyses
+    DNS_CACHE_TTL = 300.0
+
     def __init__(self):
         self.config = load_config()
         self.theme_manager = ThemeManager(self.config.default_theme)
         self.network_monitor = NetworkMonitor()
         self.dashboard = Dashboard(self.theme_manager, self.network_monitor)
         self.console = Console(theme=self.theme_manager.rich_theme)
+        # Tracks whether a theme has been pushed onto the console by the
+        # 'T' toggle, so each toggle replaces the previous push
+        self._theme_pushed = False
         self.smtp_debugger: SMTPDebugger = None
         self.imap_debugger: IMAPDebugger = None
+        # Authenticated SMTP sessions reused across sends, keyed by
+        # (host, port, username), with a per-connection send counter
+        self._smtp_pool: dict = {}
+        self._smtp_send_counts: dict = {}
+        # host -> (resolved_at, DNSResult) for _resolve_dns_cached
+        self._dns_cache: dict = {}
+        # Test-email body with only the timestamp left to fill per send
+        self._body_template = f"""This is a test email from the Email Investigation Tool.
+
+Timestamp: {{ts}}
+Tool Version: 0.1.0
+SMTP Server: {self.config.smtp.host}:{self.config.smtp.port}
+
+This email is being sent to test SMTP functionality and debug potential issues."""
         self.network_analyzer = NetworkAnalyzer()
         self.file_generator = FileGenerator()
         self.gpg_manager = GPGManager()
@@ -54,33 +83,93 @@ class EmailInvestigationTool:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
-        # Setup file handler
+        # Setup file handler. The FileHandler sits behind a MemoryHandler
+        # so verbose SMTP traces batch into one flush per ~1024 records
+        # instead of a write() syscall per protocol line; errors and
+        # shutdown flush immediately.
         log_file = log_dir / f"email_debug_{int(time.time())}.log"
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._log_buffer = logging.handlers.MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        atexit.register(self._log_buffer.flush)
+
+        # Kept as an attribute so main_loop can detach it while the Live
+        # dashboard owns the terminal and reattach it around prompts
+        self._stream_handler = logging.StreamHandler()
+
+        # Emitters only enqueue; a listener thread feeds the memory
+        # buffer, so callers on the SMTP protocol path never wait on
+        # handler locks or file I/O
+        self._log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, self._log_buffer)
+        self._log_listener.start()
+        atexit.register(self._stop_log_listener)
+
         logging.basicConfig(
             level=getattr(logging, self.config.log_level),
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
+                logging.handlers.QueueHandler(self._log_queue),
+                self._stream_handler
             ]
         )
-        
+
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"Email Investigation Tool starting - Log file: {log_file}")
+
+        # Bound methods for the per-protocol-line callback, hoisting the
+        # attribute lookups out of the hot path
+        self._log_info = self.logger.info
+        self._dash_add = self.dashboard.add_smtp_log_entry
         
         # Start network monitoring
         self.network_monitor.start_monitoring()
         self.logger.info(f"Network monitoring started - Network log: {self.network_monitor.log_file_path}")
     
+    def _stop_log_listener(self):
+        """Drain and stop the log listener thread, exactly once."""
+        if self._log_listener._thread is not None:
+            self._log_listener.stop()
+
     def _smtp_log_callback(self, entry: SMTPLogEntry):
-        """Callback for SMTP log entries."""
-        self.dashboard.add_smtp_log_entry(entry)
-        
-        # Also log to file
-        direction = "SEND" if entry.direction == "→" else "RECV"
-        timing = f" ({entry.timing_info})" if entry.timing_info else ""
-        self.logger.info(f"SMTP {direction}: {entry.data}{timing}")
+        """Callback for SMTP log entries.
+
+        Runs once per protocol line; %-style args defer formatting
+        until after the level filter.
+        """
+        self._dash_add(entry)
+        self._log_info(
+            "SMTP %s: %s%s",
+            "SEND" if entry.direction == "→" else "RECV",
+            entry.data_str,
+            f" ({entry.timing_info})" if entry.timing_info else ""
+        )
     
+    def _resolve_dns_cached(self, host: str):
+        """Resolve a host, reusing a recent successful result.
+
+        The SMTP host rarely changes within a session, so repeated 'N'
+        presses shouldn't each pay a recursive DNS round trip. Failures
+        are never cached — a retry should always hit the resolver.
+        """
+        cached = self._dns_cache.get(host)
+        if cached is not None:
+            resolved_at, result = cached
+            if time.time() - resolved_at < self.DNS_CACHE_TTL:
+                return result
+
+        result = self.network_analyzer.resolve_dns(host)
+        if result.ip_addresses:
+            self._dns_cache[host] = (time.time(), result)
+        return result
+
     async def run_network_analysis(self, clear_screen=False):
         """Run comprehensive network analysis."""
         if clear_screen:
@@ -88,21 +177,51 @@ class EmailInvestigationTool:
             self.console.clear()
         
         self.console.print("[yellow]Running network analysis...[/yellow]")
-        
-        # DNS analysis
-        self.console.print(f"[cyan]• Resolving DNS for {self.config.smtp.host}...[/cyan]")
-        dns_result = self.network_analyzer.resolve_dns(self.config.smtp.host)
+
+        # The four sub-steps are independent and entirely I/O-bound, so
+        # they run concurrently off the event loop; total wall time is
+        # roughly the slowest step (usually traceroute) instead of the
+        # sum. Console output and dashboard updates happen afterwards,
+        # in the original order, so the report stays readable.
+        host = self.config.smtp.host
+        self.console.print(f"[cyan]• Probing {host} (DNS, traceroute, ports, ISP analysis)...[/cyan]")
+
+        # Resolve first (cheap, usually cached): if the host doesn't
+        # resolve, every downstream probe would just burn its own
+        # timeout budget re-failing the same lookup
+        dns_result = await asyncio.to_thread(self._resolve_dns_cached, host)
+
         if dns_result.ip_addresses:
             self.console.print(f"[green]  ✓ Resolved to {dns_result.ip_addresses[0]} ({dns_result.response_time:.3f}s)[/green]")
         else:
             self.console.print(f"[red]  ✗ DNS resolution failed[/red]")
-        
+            self.console.print("[red]  ✗ Skipping traceroute/ports/ISP analysis: host unresolvable[/red]")
+            if clear_screen:
+                self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
+                self.console.input()
+            return
+
+        # Thread the resolved address through so the probes don't each
+        # re-resolve the hostname (and possibly land on different
+        # round-robin answers)
+        ip = dns_result.ip_addresses[0]
+        network_path, port_results = await asyncio.gather(
+            asyncio.to_thread(self.network_analyzer.traceroute, host,
+                              resolved_ip=ip),
+            asyncio.to_thread(self.network_analyzer.scan_smtp_ports, host,
+                              resolved_ip=ip),
+        )
+        # Feed the probes just gathered into the ISP analysis so it
+        # only runs the DPI/ISP checks instead of re-firing its own
+        # traceroute and port scan at the same host
+        isp_analysis = await asyncio.to_thread(
+            self.network_analyzer.analyze_isp_interference,
+            host, self.config.smtp.port, resolved_ip=ip,
+            network_path=network_path, port_results=port_results)
+
         # Traceroute
-        self.console.print(f"[cyan]• Tracing network path to {self.config.smtp.host}...[/cyan]")
-        self.console.print("[dim]  (Testing connectivity and network path)[/dim]")
-        network_path = self.network_analyzer.traceroute(self.config.smtp.host)
         self.dashboard.update_network_analysis(network_path)
-        
+
         if network_path.hops:
             if len(network_path.hops) > 1:
                 self.console.print(f"[green]  ✓ Traced {len(network_path.hops)} hops, avg RTT: {network_path.avg_rtt:.1f}ms[/green]")
@@ -114,10 +233,8 @@ class EmailInvestigationTool:
             self.console.print(f"[yellow]  ⚠ Network path analysis unavailable[/yellow]")
         
         # Port scanning
-        self.console.print(f"[cyan]• Scanning SMTP ports on {self.config.smtp.host}...[/cyan]")
-        port_results = self.network_analyzer.scan_smtp_ports(self.config.smtp.host)
         self.dashboard.update_port_scan(port_results)
-        
+
         open_ports = [str(p.port) for p in port_results if p.is_open]
         blocked_ports = [str(p.port) for p in port_results if not p.is_open]
         if open_ports:
@@ -126,10 +243,6 @@ class EmailInvestigationTool:
             self.console.print(f"[red]  ✗ Blocked ports: {', '.join(blocked_ports)}[/red]")
         
         # ISP analysis
-        self.console.print("[cyan]• Analyzing ISP interference patterns...[/cyan]")
-        isp_analysis = self.network_analyzer.analyze_isp_interference(
-            self.config.smtp.host, self.config.smtp.port
-        )
         self.dashboard.update_isp_analysis(isp_analysis)
         
         if isp_analysis.suspicious_behavior:
@@ -154,33 +267,41 @@ class EmailInvestigationTool:
         self.console.print("[yellow]Loading IMAP data...[/yellow]")
         
         try:
-            # Initialize IMAP debugger
+            # Reuse the debugger between reloads: its client pools the
+            # authenticated connection, so repeated 'I' presses skip the
+            # TLS + LOGIN handshake and just revalidate with NOOP
             self.console.print(f"[cyan]• Connecting to {self.config.imap.host}:{self.config.imap.port}...[/cyan]")
-            self.imap_debugger = IMAPDebugger(
-                self.config.imap.host,
-                self.config.imap.port,
-                self.config.imap.use_ssl
-            )
-            
-            # Connect and fetch data
+            if self.imap_debugger is None:
+                self.imap_debugger = IMAPDebugger(
+                    self.config.imap.host,
+                    self.config.imap.port,
+                    self.config.imap.use_ssl
+                )
+
+            # Connect and fetch data off the event loop so the Live
+            # display keeps rendering while IMAP is on the wire
             self.console.print("[cyan]• Authenticating and fetching folder list...[/cyan]")
-            folders, messages, stats = self.imap_debugger.connect_and_analyze(
+            folders, messages, stats = await asyncio.to_thread(
+                self.imap_debugger.connect_and_analyze,
                 self.config.imap.username,
                 self.config.imap.password
             )
-            
+
             if stats.errors:
                 self.console.print(f"[yellow]  ⚠ IMAP warning: {stats.errors[-1]}[/yellow]")
             else:
                 self.console.print(f"[green]  ✓ Connected in {stats.connection_time:.1f}s[/green]")
                 self.console.print(f"[green]  ✓ Found {len(folders)} folders, {len(messages)} recent messages[/green]")
                 self.dashboard.update_imap_data(folders, messages)
-            
-            # Disconnect
+
+            # Park the connection for the next reload; the real logout
+            # happens in main_loop cleanup
             self.imap_debugger.disconnect()
-            
+
         except Exception as e:
             self.console.print(f"[yellow]  ⚠ IMAP unavailable: {e}[/yellow]")
+            # Drop the debugger so the next reload starts from scratch
+            self.imap_debugger = None
         
         if clear_screen:
             self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
@@ -272,6 +393,9 @@ class EmailInvestigationTool:
             self.console.input()
             return
         
+        pool_key = (self.config.smtp.host, self.config.smtp.port,
+                    self.config.smtp.username)
+
         try:
             # Clear screen and move cursor to top
             self.console.clear()
@@ -281,39 +405,48 @@ class EmailInvestigationTool:
             self.console.print(f"[cyan]Subject: {self.dashboard.email_subject}[/cyan]")
             
             self.console.print("[yellow]Connecting to SMTP server...[/yellow]")
-            
-            # Initialize SMTP debugger
-            self.smtp_debugger = SMTPDebugger(
-                self.config.smtp.host,
-                self.config.smtp.port,
-                self.config.smtp.use_tls,
-                self._smtp_log_callback
-            )
-            
-            # Connect and authenticate
-            self.console.print("[dim]Authenticating...[/dim]")
-            stats = self.smtp_debugger.connect_and_auth(
-                self.config.smtp.username,
-                self.config.smtp.password
-            )
-            
-            if stats.errors:
-                self.console.print(f"[red]Connection failed: {stats.errors[-1]}[/red]")
-                self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
-                self.console.input()
-                return
-            
+
+            # Reuse a pooled authenticated session when one is alive; the
+            # TLS + AUTH handshake is the dominant latency of interactive
+            # sends after the first
+            self.smtp_debugger = self._smtp_pool.get(pool_key)
+            if self.smtp_debugger is not None:
+                try:
+                    self.smtp_debugger.smtp.noop()
+                    self.console.print("[dim]Reusing existing connection[/dim]")
+                    stats = self.smtp_debugger.smtp.stats
+                except Exception:
+                    self._drop_pooled_smtp(pool_key)
+
+            if self.smtp_debugger is None:
+                self.smtp_debugger = SMTPDebugger(
+                    self.config.smtp.host,
+                    self.config.smtp.port,
+                    self.config.smtp.use_tls,
+                    self._smtp_log_callback
+                )
+
+                # Connect and authenticate
+                self.console.print("[dim]Authenticating...[/dim]")
+                stats = self.smtp_debugger.connect_and_auth(
+                    self.config.smtp.username,
+                    self.config.smtp.password
+                )
+
+                if stats.errors:
+                    self.console.print(f"[red]Connection failed: {stats.errors[-1]}[/red]")
+                    self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
+                    self.console.input()
+                    return
+
+                self._smtp_pool[pool_key] = self.smtp_debugger
+                self._smtp_send_counts[pool_key] = 0
+
             self.console.print("[green]✓ Connected and authenticated[/green]")
             self.dashboard.update_stats(stats)
             
-            # Prepare email content
-            body = f"""This is a test email from the Email Investigation Tool.
-            
-Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}
-Tool Version: 0.1.0
-SMTP Server: {self.config.smtp.host}:{self.config.smtp.port}
-
-This email is being sent to test SMTP functionality and debug potential issues."""
+            # Prepare email content; only the timestamp varies per send
+            body = self._body_template.format(ts=time.strftime('%Y-%m-%d %H:%M:%S'))
             
             # Process with GPG if enabled
             if self.dashboard.gpg_sign or self.dashboard.gpg_encrypt:
@@ -336,38 +469,62 @@ This email is being sent to test SMTP functionality and debug potential issues."
             
             if attachments:
                 self.console.print(f"[dim]Attaching file: {attachments[0]}[/dim]")
-            
+
             self.console.print("[yellow]Sending email...[/yellow]")
-            send_stats = self.smtp_debugger.send_test_email(
-                self.dashboard.email_from,
-                self.dashboard.email_to,
-                self.dashboard.email_subject,
-                body,
-                attachments
-            )
+            if attachments:
+                # Stream the attachment so the full base64-encoded message
+                # is never held in memory at once
+                send_stats = self.smtp_debugger.send_test_email_stream(
+                    self.dashboard.email_from,
+                    self.dashboard.email_to,
+                    self.dashboard.email_subject,
+                    body,
+                    attachments[0]
+                )
+            else:
+                send_stats = self.smtp_debugger.send_test_email(
+                    self.dashboard.email_from,
+                    self.dashboard.email_to,
+                    self.dashboard.email_subject,
+                    body,
+                    None
+                )
             
             self.dashboard.update_stats(send_stats)
             
             if send_stats.errors:
                 self.console.print(f"[red]✗ Send failed: {send_stats.errors[-1]}[/red]")
+                # Don't trust the session after a failure
+                self._drop_pooled_smtp(pool_key)
             else:
                 self.console.print("[green]✓ Email sent successfully![/green]")
                 self.console.print(f"[dim]Total time: {send_stats.total_time:.1f}s[/dim]")
                 self.console.print(f"[dim]Bytes sent: {send_stats.bytes_sent:,}[/dim]")
-            
-            # Disconnect
-            self.smtp_debugger.disconnect()
-            
+
+                # Keep the session for the next send, recycling it once it
+                # has carried SMTP_MAX_MESSAGES messages
+                self._smtp_send_counts[pool_key] = self._smtp_send_counts.get(pool_key, 0) + 1
+                if self._smtp_send_counts[pool_key] >= self.SMTP_MAX_MESSAGES:
+                    self._drop_pooled_smtp(pool_key)
+
             self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
             self.console.input()
-            
+
         except Exception as e:
             self.console.print(f"[red]Error sending email: {e}[/red]")
-            if self.smtp_debugger:
-                self.smtp_debugger.disconnect()
+            self._drop_pooled_smtp(pool_key)
             self.console.print("[dim]Press Enter to return to dashboard...[/dim]")
             self.console.input()
     
+    def _drop_pooled_smtp(self, pool_key):
+        """Tear down and forget a pooled SMTP session."""
+        debugger = self._smtp_pool.pop(pool_key, None)
+        self._smtp_send_counts.pop(pool_key, None)
+        if debugger is not None:
+            debugger.disconnect()
+        if self.smtp_debugger is debugger:
+            self.smtp_debugger = None
+
     async def main_loop(self):
         """Main application loop with Rich Live display."""
         self.console.print("[bold green]🚀 Email Investigation Tool Starting[/bold green]")
@@ -384,58 +541,154 @@ This email is being sent to test SMTP functionality and debug potential issues."
         self.console.print("[bold green]🎯 Initialization Complete - Starting Dashboard[/bold green]")
         self.console.print()
         
-        with Live(self.dashboard.render(), console=self.console, refresh_per_second=1) as live:
-            self.console.print("[green]Email Investigation Tool started![/green]")
-            self.console.print("Commands: [cyan]T[/cyan]=Theme, [cyan]G[/cyan]=Generate File, [cyan]C[/cyan]=Compose, [cyan]S[/cyan]=Send, [cyan]N[/cyan]=Network Analysis, [cyan]I[/cyan]=Reload IMAP, [cyan]Q[/cyan]=Quit")
-            
-            while self.running:
-                try:
-                    # Get user input (non-blocking)
-                    key = self.console.input("")
-                    
-                    if key.lower() == 'q':
+        # Non-blocking keyboard handling: console.input() would wedge the
+        # event loop inside Live, freezing the dashboard until a key
+        # arrived. Keystrokes instead flow from a stdin reader on the loop
+        # into a queue, and the loop ticks on a timeout while idle so
+        # live.update keeps refreshing.
+        loop = asyncio.get_running_loop()
+        input_queue: asyncio.Queue = asyncio.Queue()
+        stdin_fd = sys.stdin.fileno()
+
+        def _on_stdin_readable():
+            data = os.read(stdin_fd, 1)
+            if data:
+                input_queue.put_nowait(data.decode('utf-8', errors='ignore'))
+
+        old_term = None
+        reader_installed = False
+        try:
+            old_term = termios.tcgetattr(stdin_fd)
+            tty.setcbreak(stdin_fd)
+        except (termios.error, ValueError, OSError):
+            old_term = None
+        try:
+            loop.add_reader(stdin_fd, _on_stdin_readable)
+            reader_installed = True
+        except (ValueError, OSError):
+            # stdin isn't selectable (e.g. redirected); fall back to
+            # blocking reads off the event loop
+            reader_installed = False
+
+        def _suspend_key_input():
+            # Hand the terminal back to line-oriented prompts while a
+            # live-stopped interactive flow runs, and let log records
+            # reach stderr again while Live isn't painting
+            if reader_installed:
+                loop.remove_reader(stdin_fd)
+            if old_term is not None:
+                termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_term)
+            logging.getLogger().addHandler(self._stream_handler)
+
+        def _resume_key_input():
+            logging.getLogger().removeHandler(self._stream_handler)
+            if old_term is not None:
+                tty.setcbreak(stdin_fd)
+            if reader_installed:
+                loop.add_reader(stdin_fd, _on_stdin_readable)
+
+        # While Live repaints the screen, stderr log lines would fight
+        # the live region for the TTY; route records to file only
+        logging.getLogger().removeHandler(self._stream_handler)
+        try:
+            with Live(self.dashboard.render(), console=self.console, refresh_per_second=1) as live:
+                self.console.print("[green]Email Investigation Tool started![/green]")
+                self.console.print("Commands: [cyan]T[/cyan]=Theme, [cyan]G[/cyan]=Generate File, [cyan]C[/cyan]=Compose, [cyan]S[/cyan]=Send, [cyan]N[/cyan]=Network Analysis, [cyan]I[/cyan]=Reload IMAP, [cyan]Q[/cyan]=Quit")
+
+                # The input wait doubles as the render timer: idle ticks
+                # arrive exactly when Live's next repaint is due
+                refresh_period = 1.0 / live.refresh_per_second
+
+                while self.running:
+                    try:
+                        # Wait for a keystroke; on timeout just refresh
+                        # the dashboard and keep ticking
+                        if reader_installed:
+                            try:
+                                key = await asyncio.wait_for(input_queue.get(), timeout=refresh_period)
+                            except asyncio.TimeoutError:
+                                # Idle tick: repaint only if something changed
+                                if self.dashboard.is_dirty:
+                                    live.update(self.dashboard.render())
+                                continue
+                        elif old_term is not None:
+                            # cbreak is active but stdin isn't selectable:
+                            # still read single keystrokes, just blocking
+                            # on a worker thread
+                            key = await asyncio.to_thread(sys.stdin.read, 1)
+                        else:
+                            key = await asyncio.to_thread(self.console.input, "")
+
+                        if key.lower() == 'q':
+                            self.running = False
+                        elif key.lower() == 't':
+                            self.dashboard.toggle_theme()
+                            # Swap styles on the existing console rather than
+                            # rebuilding it, keeping Rich's render caches warm
+                            if self._theme_pushed:
+                                self.console.pop_theme()
+                            self.console.push_theme(self.theme_manager.rich_theme, inherit=False)
+                            self._theme_pushed = True
+                            live.update(self.dashboard.render())
+                        elif key.lower() == 'g':
+                            live.stop()
+                            _suspend_key_input()
+                            self.generate_test_file()
+                            _resume_key_input()
+                            live.start()
+                            live.update(self.dashboard.render())
+                        elif key.lower() == 'c':
+                            live.stop()
+                            _suspend_key_input()
+                            self.compose_email()
+                            _resume_key_input()
+                            live.start()
+                            live.update(self.dashboard.render())
+                        elif key.lower() == 's':
+                            live.stop()
+                            _suspend_key_input()
+                            await self.send_test_email()
+                            _resume_key_input()
+                            live.start()
+                            live.update(self.dashboard.render())
+                        elif key.lower() == 'n':
+                            live.stop()
+                            _suspend_key_input()
+                            await self.run_network_analysis(clear_screen=True)
+                            _resume_key_input()
+                            live.start()
+                            live.update(self.dashboard.render())
+                        elif key.lower() == 'i':
+                            live.stop()
+                            _suspend_key_input()
+                            await self.load_imap_data(clear_screen=True)
+                            _resume_key_input()
+                            live.start()
+                            live.update(self.dashboard.render())
+
+                    except KeyboardInterrupt:
                         self.running = False
-                    elif key.lower() == 't':
-                        self.dashboard.toggle_theme()
-                        self.console = Console(theme=self.theme_manager.rich_theme)
-                        live.console = self.console
-                        live.update(self.dashboard.render())
-                    elif key.lower() == 'g':
-                        live.stop()
-                        self.generate_test_file()
-                        live.start()
-                        live.update(self.dashboard.render())
-                    elif key.lower() == 'c':
-                        live.stop()
-                        self.compose_email()
-                        live.start()
-                        live.update(self.dashboard.render())
-                    elif key.lower() == 's':
-                        live.stop()
-                        await self.send_test_email()
-                        live.start()
-                        live.update(self.dashboard.render())
-                    elif key.lower() == 'n':
-                        live.stop()
-                        await self.run_network_analysis(clear_screen=True)
-                        live.start()
-                        live.update(self.dashboard.render())
-                    elif key.lower() == 'i':
-                        live.stop()
-                        await self.load_imap_data(clear_screen=True)
-                        live.start()
-                        live.update(self.dashboard.render())
-                    
-                    # Small delay to prevent excessive CPU usage
-                    await asyncio.sleep(0.1)
-                    
-                except KeyboardInterrupt:
-                    self.running = False
-                except Exception as e:
-                    self.logger.error(f"Error in main loop: {e}")
-        
+                    except Exception as e:
+                        self.logger.error(f"Error in main loop: {e}")
+        finally:
+            # Always give the terminal back, whatever ended the loop
+            if reader_installed:
+                try:
+                    loop.remove_reader(stdin_fd)
+                except (ValueError, OSError):
+                    pass
+            if old_term is not None:
+                termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_term)
+            logging.getLogger().addHandler(self._stream_handler)
+
         # Cleanup
         self.console.print("[yellow]Stopping network monitoring and generating report...[/yellow]")
+        self._stop_log_listener()
+        self._log_buffer.flush()
+        if self.imap_debugger:
+            self.imap_debugger.disconnect(to_pool=False)
+        for pool_key in list(self._smtp_pool):
+            self._drop_pooled_smtp(pool_key)
         self.network_monitor.stop_monitoring()
         
         # Generate network monitoring report
@@ -453,7 +706,7 @@ This email is being sent to test SMTP functionality and debug potential issues."
         else:
             self.console.print("[green]No suspicious network connections detected.[/green]")
         
-        self.file_generator.cleanup_all()
+        self.file_generator.cleanup_all_parallel()
         self.console.print("[yellow]Email Investigation Tool shutdown complete.[/yellow]")
 
 def main():
@@ -1,14 +1,18 @@
 """Network analysis and ISP interference detection."""
 
+import re
+import select
 import socket
+import statistics
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import dns.resolver
 import dns.query
 import dns.zone
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-import re
 
 @dataclass
 class DNSResult:
@@ -19,6 +23,52 @@ class DNSResult:
     response_time: float
     authoritative: bool
     dnssec_valid: bool = False
+    resolved_at: float = 0.0
+    ttl: int = 0
+
+# Failed lookups are remembered briefly so retries don't hammer the
+# resolver; long enough to cover one analysis pass, short enough that a
+# transient outage clears quickly
+_NEGATIVE_CACHE_TTL = 60.0
+
+# How long a traced NetworkPath stays fresh before re-probing
+_PATH_CACHE_TTL = 300.0
+
+# Base UDP destination port for in-process traceroute probes. The TTL is
+# encoded in the port (base + ttl) so ICMP replies can be matched back to
+# their hop without per-probe state.
+_TRACE_BASE_PORT = 33434
+
+# How long to wait for ICMP replies after all probes are in flight
+_TRACE_DEADLINE = 1.0
+
+# ISP signatures looked for in traceroute hop hostnames. The patterns
+# compile into one alternation so each hostname is scanned once, with the
+# match mapped back to its ISP by dict lookup.
+_ISP_PATTERNS = {
+    'comcast': ['comcast', 'xfinity'],
+    'verizon': ['verizon', 'fios'],
+    'att': ['att.net', 'attdns'],
+    'cox': ['cox.net'],
+    'charter': ['charter', 'spectrum'],
+    'centurylink': ['centurylink', 'qwest'],
+}
+# Keyed and matched as bytes: hostnames are ASCII on the wire, and
+# bytes.lower() plus a bytes pattern skip str's unicode machinery on the
+# per-hop path
+_ISP_BY_PATTERN = {
+    pattern.encode('ascii'): isp
+    for isp, patterns in _ISP_PATTERNS.items()
+    for pattern in patterns
+}
+_ISP_RE = re.compile(b'|'.join(re.escape(p) for p in _ISP_BY_PATTERN))
+
+def _is_ipv4(token: str) -> bool:
+    """True if a token is a dotted-quad IPv4 address."""
+    if token.count('.') != 3:
+        return False
+    octets = token.split('.')
+    return all(o.isdigit() and int(o) < 256 for o in octets)
 
 @dataclass
 class TracerouteHop:
@@ -39,6 +89,10 @@ class NetworkPath:
     packet_loss: float
     avg_rtt: float
     isp_detected: Optional[str] = None
+    p95_rtt: float = 0.0
+    # Stddev of RTT deltas between successive hops; spikes suggest a
+    # shaped or congested segment mid-path
+    jitter: float = 0.0
 
 @dataclass
 class PortScanResult:
@@ -64,62 +118,158 @@ class NetworkAnalyzer:
     
     def __init__(self):
         self.dns_resolver = dns.resolver.Resolver()
+        # Defaults (5s timeout, 30s lifetime) make failures crawl; an
+        # investigation tool wants them to surface fast. EDNS0 with a
+        # 4KB buffer keeps large MX answers on UDP instead of retrying
+        # over TCP.
+        self.dns_resolver.timeout = 2.0
+        self.dns_resolver.lifetime = 4.0
+        self.dns_resolver.use_edns(0, 0, 4096)
         self.analysis_cache: Dict[str, DNSResult] = {}
-    
+        # hostname -> time of last failed lookup
+        self._neg_cache: Dict[str, float] = {}
+        # target -> (traced_at, path); paths change on the minute-to-hour
+        # scale, so repeat analyses within the TTL skip the probing entirely
+        self._path_cache: Dict[str, Tuple[float, NetworkPath]] = {}
+        self._cache_lock = threading.Lock()
+
     def resolve_dns(self, hostname: str, record_type: str = 'A') -> DNSResult:
-        """Resolve DNS with detailed analysis."""
+        """Resolve DNS with detailed analysis.
+
+        Successful results are served from cache for the record's TTL;
+        failures are remembered for a short negative-cache window so
+        repeated analysis passes don't re-pay the resolver round trip.
+        """
+        now = time.time()
+        with self._cache_lock:
+            cached = self.analysis_cache.get(hostname)
+            if cached is not None and now - cached.resolved_at < cached.ttl:
+                return cached
+            failed_at = self._neg_cache.get(hostname)
+            if failed_at is not None and now - failed_at < _NEGATIVE_CACHE_TTL:
+                return DNSResult(
+                    hostname=hostname,
+                    ip_addresses=[],
+                    mx_records=[],
+                    response_time=0.0,
+                    authoritative=False,
+                    resolved_at=failed_at
+                )
+
         start_time = time.time()
-        
+
         try:
-            # Resolve A records
-            a_records = []
-            try:
-                answers = self.dns_resolver.resolve(hostname, 'A')
-                a_records = [str(rdata) for rdata in answers]
-            except:
-                pass
-            
-            # Resolve MX records
-            mx_records = []
-            try:
-                mx_answers = self.dns_resolver.resolve(hostname, 'MX')
-                mx_records = [(rdata.preference, str(rdata.exchange)) for rdata in mx_answers]
-            except:
-                pass
-            
+            # Fire the A and MX queries together; response_time is the
+            # slower of the two rather than their sum
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                a_future = pool.submit(self.dns_resolver.resolve, hostname, 'A')
+                mx_future = pool.submit(self.dns_resolver.resolve, hostname, 'MX')
+
+                a_records = []
+                ttl = 0
+                try:
+                    answers = a_future.result()
+                    a_records = [str(rdata) for rdata in answers]
+                    ttl = answers.rrset.ttl
+                except:
+                    pass
+
+                mx_records = []
+                try:
+                    mx_answers = mx_future.result()
+                    mx_records = [(rdata.preference, str(rdata.exchange)) for rdata in mx_answers]
+                    # Serve from cache only while every record is fresh
+                    ttl = min(ttl, mx_answers.rrset.ttl) if ttl else mx_answers.rrset.ttl
+                except:
+                    pass
+
             response_time = time.time() - start_time
-            
+
             # Check if response is authoritative (simplified)
             authoritative = len(a_records) > 0
-            
+
             result = DNSResult(
                 hostname=hostname,
                 ip_addresses=a_records,
                 mx_records=mx_records,
                 response_time=response_time,
-                authoritative=authoritative
+                authoritative=authoritative,
+                resolved_at=start_time,
+                ttl=ttl
             )
-            
-            self.analysis_cache[hostname] = result
+
+            with self._cache_lock:
+                if a_records:
+                    self.analysis_cache[hostname] = result
+                    self._neg_cache.pop(hostname, None)
+                else:
+                    self._neg_cache[hostname] = start_time
             return result
-            
+
         except Exception as e:
+            with self._cache_lock:
+                self._neg_cache[hostname] = start_time
             return DNSResult(
                 hostname=hostname,
                 ip_addresses=[],
                 mx_records=[],
                 response_time=time.time() - start_time,
-                authoritative=False
+                authoritative=False,
+                resolved_at=start_time
             )
     
-    def traceroute(self, target: str, max_hops: int = 15) -> NetworkPath:
-        """Perform traceroute to target."""
+    def traceroute(self, target: str, max_hops: int = 15,
+                   resolved_ip: Optional[str] = None) -> NetworkPath:
+        """Perform traceroute to target.
+
+        Pass resolved_ip to probe an already-resolved address and skip
+        this call's own DNS lookup. Completed paths are cached for
+        _PATH_CACHE_TTL so repeat analyses of the same host skip the
+        probing entirely.
+        """
+        now = time.time()
+        with self._cache_lock:
+            cached = self._path_cache.get(target)
+            if cached is not None and now - cached[0] < _PATH_CACHE_TTL:
+                return cached[1]
+
         hops = []
         consecutive_timeouts = 0
-        
+        probe_target = resolved_ip or target
+
+        # Resolve once so the raw-socket path probes an address directly,
+        # going through resolve_dns so a recent analysis pass's cached
+        # answer is reused instead of a fresh libc lookup
+        target_ip = resolved_ip
+        if target_ip is None:
+            dns_result = self.resolve_dns(target)
+            if dns_result.ip_addresses:
+                target_ip = dns_result.ip_addresses[0]
+            else:
+                try:
+                    target_ip = socket.gethostbyname(target)
+                except socket.gaierror:
+                    target_ip = None
+
+        # Preferred path: probe every TTL at once in-process, which takes
+        # roughly one RTT deadline instead of the subprocess's serial walk
+        if target_ip:
+            try:
+                hops = self._traceroute_concurrent(target_ip, max_hops)
+            except OSError:
+                # Raw ICMP sockets unavailable (non-root); fall through
+                # to the system traceroute
+                hops = []
+
+        if hops:
+            path = self._build_network_path(target, hops)
+            with self._cache_lock:
+                self._path_cache[target] = (time.time(), path)
+            return path
+
         try:
             # Use system traceroute command with aggressive timeouts to avoid hanging
-            cmd = ['traceroute', '-n', '-m', str(max_hops), '-w', '1', target]
+            cmd = ['traceroute', '-n', '-m', str(max_hops), '-w', '1', probe_target]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
             
             lines = result.stdout.strip().split('\n')[1:]  # Skip header
@@ -145,42 +295,43 @@ class NetworkAnalyzer:
                         else:
                             consecutive_timeouts = 0  # Reset timeout counter
                         
-                        # Extract IP address - look for patterns like (IP) or standalone IP
+                        # Walk the whitespace-delimited tokens once:
+                        # '(IP)' means the previous token is a hostname,
+                        # a bare dotted quad is the hop address, and the
+                        # first float followed by 'ms' is the RTT
                         ip_addr = None
                         hostname = None
-                        
-                        # Look for IP in parentheses first (most common)
-                        ip_match = re.search(r'\(([0-9]+\.[0-9]+\.[0-9]+\.[0-9]+)\)', line)
-                        if ip_match:
-                            ip_addr = ip_match.group(1)
-                            # Hostname is typically before the parentheses
-                            hostname_match = re.search(r'\s+([^\s]+)\s+\(' + re.escape(ip_addr) + r'\)', line)
-                            if hostname_match:
-                                hostname = hostname_match.group(1)
-                        else:
-                            # Look for standalone IP address
-                            ip_match = re.search(r'\s+([0-9]+\.[0-9]+\.[0-9]+\.[0-9]+)', line)
-                            if ip_match:
-                                ip_addr = ip_match.group(1)
-                        
+                        response_time = 0.0
+
+                        for i, tok in enumerate(parts[1:], 1):
+                            if tok.startswith('(') and tok.endswith(')'):
+                                cand = tok[1:-1]
+                                if _is_ipv4(cand) and ip_addr is None:
+                                    ip_addr = cand
+                                    if i > 1:
+                                        hostname = parts[i - 1]
+                            elif ip_addr is None and _is_ipv4(tok):
+                                ip_addr = tok
+                            elif tok == 'ms' and not response_time and i > 1:
+                                try:
+                                    response_time = float(parts[i - 1])
+                                except ValueError:
+                                    pass
+
                         # Skip if we couldn't find an IP
                         if not ip_addr:
                             continue
-                        
-                        # Extract timing info - get the first ms value
-                        time_match = re.search(r'(\d+\.?\d*)\s*ms', line)
-                        response_time = float(time_match.group(1)) if time_match else 0.0
-                        
+
                         # Use the IP as hostname if we didn't find one
                         if not hostname:
                             hostname = ip_addr
-                        
+
                         hop = TracerouteHop(
                             hop_number=hop_num,
                             ip_address=ip_addr,
                             hostname=hostname,
                             response_time=response_time,
-                            is_timeout=is_timeout
+                            is_timeout=False
                         )
                         hops.append(hop)
                         
@@ -200,10 +351,11 @@ class NetworkAnalyzer:
         # If we got no hops from traceroute, create a simple connectivity test
         if not hops:
             try:
-                # Simple connectivity test to at least show we can reach the target
-                import socket
-                target_ip = socket.gethostbyname(target)
-                
+                # Simple connectivity test to at least show we can reach
+                # the target, reusing the address resolved above
+                if target_ip is None:
+                    raise socket.gaierror
+
                 # Test connectivity with a simple socket connection
                 start_time = time.time()
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -225,15 +377,33 @@ class NetworkAnalyzer:
             except Exception:
                 # If everything fails, that's okay - we'll just show empty results
                 pass
-        
-        # Calculate statistics
+
+        path = self._build_network_path(target, hops)
+        # Only cache real traces; an empty path should be retried next pass
+        if hops:
+            with self._cache_lock:
+                self._path_cache[target] = (time.time(), path)
+        return path
+
+    def _build_network_path(self, target: str, hops: List[TracerouteHop]) -> NetworkPath:
+        """Compute path statistics and ISP detection for a hop list."""
         valid_hops = [h for h in hops if not h.is_timeout]
-        avg_rtt = sum(h.response_time for h in valid_hops) / len(valid_hops) if valid_hops else 0
+        times = [h.response_time for h in valid_hops]
+        avg_rtt = statistics.fmean(times) if times else 0.0
         packet_loss = (len(hops) - len(valid_hops)) / len(hops) * 100 if hops else 0
-        
+
+        # Distribution stats: p95 catches the one slow segment that an
+        # average hides, and jitter (stddev of successive-hop RTT deltas)
+        # is a better throttling signal than hop loss alone
+        ranked = sorted(times)
+        # Nearest-rank p95: index ceil(0.95 * n) - 1
+        p95_rtt = ranked[-(-len(ranked) * 19 // 20) - 1] if ranked else 0.0
+        deltas = [b - a for a, b in zip(times, times[1:])]
+        jitter = statistics.stdev(deltas) if len(deltas) >= 2 else 0.0
+
         # Detect ISP from hop hostnames
         isp_detected = self._detect_isp_from_hops(hops)
-        
+
         return NetworkPath(
             target_host=target,
             target_ip=hops[-1].ip_address if hops else "",
@@ -241,50 +411,169 @@ class NetworkAnalyzer:
             total_hops=len(hops),
             packet_loss=packet_loss,
             avg_rtt=avg_rtt,
-            isp_detected=isp_detected
+            isp_detected=isp_detected,
+            p95_rtt=p95_rtt,
+            jitter=jitter
         )
+
+    def _traceroute_concurrent(self, target_ip: str, max_hops: int) -> List[TracerouteHop]:
+        """Probe all TTLs at once and collect ICMP replies.
+
+        Sends one UDP probe per TTL immediately, then waits up to
+        _TRACE_DEADLINE on a single raw ICMP socket for Time Exceeded /
+        Port Unreachable replies, so the whole trace costs one deadline
+        rather than a serial walk. Raises OSError when raw sockets are
+        unavailable.
+        """
+        icmp_sock = socket.socket(socket.AF_INET, socket.SOCK_RAW,
+                                  socket.IPPROTO_ICMP)
+        icmp_sock.setblocking(False)
+        send_times: Dict[int, float] = {}
+        replies: Dict[int, Tuple[str, float]] = {}
+        reached_ttl: Optional[int] = None
+        probes = []
+        try:
+            for ttl in range(1, max_hops + 1):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                probes.append(sock)
+                send_times[ttl] = time.time()
+                sock.sendto(b'', (target_ip, _TRACE_BASE_PORT + ttl))
+
+            deadline = time.time() + _TRACE_DEADLINE
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select([icmp_sock], [], [], remaining)
+                if not readable:
+                    break
+                now = time.time()
+                try:
+                    data, addr = icmp_sock.recvfrom(512)
+                except BlockingIOError:
+                    continue
+
+                ttl = self._match_probe(data)
+                if ttl is None or ttl > max_hops or ttl in replies:
+                    continue
+                rtt_ms = (now - send_times.get(ttl, now)) * 1000
+                replies[ttl] = (addr[0], rtt_ms)
+
+                if data[(data[0] & 0x0F) * 4] == 3 or addr[0] == target_ip:
+                    # Destination answered; its TTL caps the path
+                    reached_ttl = ttl if reached_ttl is None else min(reached_ttl, ttl)
+                if reached_ttl is not None and all(
+                        t in replies for t in range(1, reached_ttl + 1)):
+                    break
+        finally:
+            icmp_sock.close()
+            for sock in probes:
+                sock.close()
+
+        if reached_ttl is not None:
+            # Probes with higher TTLs also reached the destination;
+            # drop those duplicate terminal hops
+            replies = {t: r for t, r in replies.items() if t <= reached_ttl}
+
+        return [
+            TracerouteHop(
+                hop_number=ttl,
+                ip_address=replies[ttl][0],
+                hostname=replies[ttl][0],
+                response_time=replies[ttl][1],
+                is_timeout=False
+            )
+            for ttl in sorted(replies)
+        ]
+
+    @staticmethod
+    def _match_probe(data: bytes) -> Optional[int]:
+        """Map an ICMP reply back to the probe TTL encoded in its port."""
+        outer_ihl = (data[0] & 0x0F) * 4 if data else 0
+        if not data or len(data) < outer_ihl + 8:
+            return None
+        if data[outer_ihl] not in (11, 3):  # Time Exceeded / Unreachable
+            return None
+        inner = data[outer_ihl + 8:]
+        if len(inner) < 20 or inner[9] != socket.IPPROTO_UDP:
+            return None
+        inner_ihl = (inner[0] & 0x0F) * 4
+        if len(inner) < inner_ihl + 4:
+            return None
+        dst_port = int.from_bytes(inner[inner_ihl + 2:inner_ihl + 4], 'big')
+        ttl = dst_port - _TRACE_BASE_PORT
+        return ttl if ttl >= 1 else None
     
-    def scan_smtp_ports(self, hostname: str) -> List[PortScanResult]:
-        """Scan common SMTP ports."""
+    @staticmethod
+    def _timed_connect(host: str, port: int,
+                       timeout: float) -> Tuple[Optional[socket.socket], float, Optional[OSError]]:
+        """Open a TCP connection and time the handshake precisely.
+
+        Returns (socket, seconds, error); the socket is None when the
+        connect failed, with the error alongside so callers can inspect
+        it (e.g. for RSTs). perf_counter keeps the timing monotonic.
+        """
+        start = time.perf_counter()
+        try:
+            sock = socket.create_connection((host, port), timeout=timeout)
+        except OSError as e:
+            return None, time.perf_counter() - start, e
+        return sock, time.perf_counter() - start, None
+
+    def _probe_port(self, connect_host: str, port: int) -> PortScanResult:
+        """Attempt a TCP connect to one port and time it."""
+        sock, elapsed, _ = self._timed_connect(connect_host, port, 5.0)
+        if sock is not None:
+            sock.close()
+        return PortScanResult(
+            port=port,
+            is_open=sock is not None,
+            response_time=elapsed if sock is not None else None,
+            service=self._get_smtp_service_name(port)
+        )
+
+    def scan_smtp_ports(self, hostname: str,
+                        resolved_ip: Optional[str] = None) -> List[PortScanResult]:
+        """Scan common SMTP ports.
+
+        The probes run concurrently, so wall time is one connect timeout
+        instead of one per port. Pass resolved_ip to connect to an
+        already-resolved address and skip the per-port DNS lookups.
+        """
         smtp_ports = [25, 465, 587, 2525]
-        results = []
-        
-        for port in smtp_ports:
-            start_time = time.time()
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5.0)
-                result = sock.connect_ex((hostname, port))
-                response_time = time.time() - start_time
-                sock.close()
-                
-                is_open = result == 0
-                service = self._get_smtp_service_name(port)
-                
-                results.append(PortScanResult(
-                    port=port,
-                    is_open=is_open,
-                    response_time=response_time if is_open else None,
-                    service=service
-                ))
-                
-            except Exception:
-                results.append(PortScanResult(
-                    port=port,
-                    is_open=False,
-                    service=self._get_smtp_service_name(port)
-                ))
-        
-        return results
+        connect_host = resolved_ip or hostname
+
+        with ThreadPoolExecutor(max_workers=len(smtp_ports)) as pool:
+            return list(pool.map(
+                lambda port: self._probe_port(connect_host, port), smtp_ports))
     
-    def analyze_isp_interference(self, hostname: str, port: int) -> ISPAnalysis:
-        """Analyze potential ISP interference."""
+    def analyze_isp_interference(self, hostname: str, port: int,
+                                 resolved_ip: Optional[str] = None,
+                                 network_path: Optional[NetworkPath] = None,
+                                 port_results: Optional[List[PortScanResult]] = None) -> ISPAnalysis:
+        """Analyze potential ISP interference.
+
+        Pass resolved_ip to reuse one DNS answer across the port scan,
+        traceroute, and DPI check instead of re-resolving per step. A
+        caller that already ran the traceroute and port scan can hand
+        the results in via network_path/port_results so this analysis
+        doesn't fire a second round of probes at the same host.
+        """
         suspicious_behavior = []
         blocked_ports = []
         recommendations = []
-        
-        # Scan SMTP ports
-        port_results = self.scan_smtp_ports(hostname)
+
+        if network_path is None or port_results is None:
+            # The port scan and traceroute are independent; overlap them
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                scan_future = pool.submit(
+                    self.scan_smtp_ports, hostname, resolved_ip=resolved_ip)
+                trace_future = pool.submit(
+                    self.traceroute, hostname, resolved_ip=resolved_ip)
+                port_results = scan_future.result()
+                network_path = trace_future.result()
+
         for result in port_results:
             if not result.is_open:
                 blocked_ports.append(result.port)
@@ -295,9 +584,6 @@ class NetworkAnalyzer:
         if 25 in blocked_ports:
             recommendations.append("Use port 587 or 465 instead of port 25")
         
-        # Analyze network path
-        network_path = self.traceroute(hostname)
-        
         # Check for suspicious routing
         if network_path.packet_loss > 5:
             suspicious_behavior.append(f"High packet loss: {network_path.packet_loss:.1f}%")
@@ -312,10 +598,13 @@ class NetworkAnalyzer:
                 recommendations.append("Consider using VPN or alternative SMTP relay")
         
         # Simple DPI detection (more sophisticated detection would require packet analysis)
-        dpi_detected = self._detect_dpi_signatures(hostname, port)
+        dpi_detected = self._detect_dpi_signatures(resolved_ip or hostname, port)
         
-        # Throttling detection (simplified)
-        throttling_detected = len(blocked_ports) > 1 or network_path.packet_loss > 2
+        # Throttling detection: hop-to-hop jitter spikes are a stronger
+        # shaping signal than the old packet-loss-only check
+        throttling_detected = (len(blocked_ports) > 1
+                               or network_path.packet_loss > 2
+                               or network_path.jitter > 50)
         
         return ISPAnalysis(
             isp_name=network_path.isp_detected,
@@ -329,23 +618,13 @@ class NetworkAnalyzer:
     
     def _detect_isp_from_hops(self, hops: List[TracerouteHop]) -> Optional[str]:
         """Detect ISP from traceroute hop hostnames."""
-        isp_patterns = {
-            'comcast': ['comcast', 'xfinity'],
-            'verizon': ['verizon', 'fios'],
-            'att': ['att.net', 'attdns'],
-            'cox': ['cox.net'],
-            'charter': ['charter', 'spectrum'],
-            'centurylink': ['centurylink', 'qwest'],
-        }
-        
         for hop in hops:
             if hop.hostname:
-                hostname_lower = hop.hostname.lower()
-                for isp, patterns in isp_patterns.items():
-                    for pattern in patterns:
-                        if pattern in hostname_lower:
-                            return isp.upper()
-        
+                name = hop.hostname.encode('ascii', 'ignore').lower()
+                match = _ISP_RE.search(name)
+                if match:
+                    return _ISP_BY_PATTERN[match.group(0)].upper()
+
         return None
     
     def _get_smtp_service_name(self, port: int) -> str:
@@ -363,28 +642,34 @@ class NetworkAnalyzer:
         # This is a simplified check - real DPI detection would require
         # analyzing packet timing, content inspection, etc.
         
+        sock, _, _ = self._timed_connect(hostname, port, 10.0)
+        if sock is None:
+            return False
+
         try:
-            # Quick connection test
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(10.0)
-            start_time = time.time()
-            sock.connect((hostname, port))
-            
-            # Send a test EHLO command
+            # Send a test EHLO command and time the exchange
+            start_time = time.perf_counter()
             sock.send(b"EHLO test.example.com\r\n")
             response = sock.recv(1024)
-            
-            response_time = time.time() - start_time
-            sock.close()
-            
+            response_time = time.perf_counter() - start_time
+
             # If response takes unusually long, might indicate DPI
             return response_time > 5.0
-            
+
         except Exception:
             return False
+        finally:
+            sock.close()
     
-    def test_connection_stability(self, hostname: str, port: int, duration: int = 30) -> Dict[str, any]:
-        """Test connection stability over time."""
+    def test_connection_stability(self, hostname: str, port: int, duration: int = 30,
+                                  concurrent: bool = True) -> Dict[str, any]:
+        """Test connection stability over time.
+
+        By default the probes run concurrently: elapsed time is one
+        probe latency instead of duration, and simultaneous connects are
+        what ISP rate-limiting actually reacts to. Pass concurrent=False
+        to restore the old one-probe-per-5-seconds pacing.
+        """
         results = {
             'successful_connections': 0,
             'failed_connections': 0,
@@ -392,28 +677,34 @@ class NetworkAnalyzer:
             'reset_detected': False,
             'avg_connection_time': 0.0
         }
-        
-        test_count = duration // 5  # Test every 5 seconds
-        
-        for i in range(test_count):
-            try:
-                start_time = time.time()
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5.0)
-                sock.connect((hostname, port))
-                connection_time = time.time() - start_time
+
+        test_count = duration // 5  # One probe per 5 seconds of budget
+
+        def _record(outcome):
+            sock, connection_time, error = outcome
+            if sock is not None:
                 sock.close()
-                
                 results['successful_connections'] += 1
                 results['connection_times'].append(connection_time)
-                
-            except socket.error as e:
+            else:
                 results['failed_connections'] += 1
-                if "reset" in str(e).lower():
+                if error is not None and "reset" in str(error).lower():
                     results['reset_detected'] = True
-            
-            if i < test_count - 1:  # Don't sleep after last iteration
-                time.sleep(5)
+
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=test_count or 1) as pool:
+                futures = [
+                    pool.submit(self._timed_connect, hostname, port, 5.0)
+                    for _ in range(test_count)
+                ]
+                for future in futures:
+                    _record(future.result())
+        else:
+            for i in range(test_count):
+                _record(self._timed_connect(hostname, port, 5.0))
+
+                if i < test_count - 1:  # Don't sleep after last iteration
+                    time.sleep(5)
         
         if results['connection_times']:
             results['avg_connection_time'] = sum(results['connection_times']) / len(results['connection_times'])
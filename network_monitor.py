@@ -1,16 +1,21 @@
 """Network traffic monitoring for the email investigation tool."""
 
 import os
+import queue
+import re
 import time
 import threading
 import psutil
 import socket
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass
+from collections import OrderedDict
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 import logging
+import logging.handlers
 
-@dataclass
+@dataclass(slots=True)
 class NetworkConnection:
     """Represents a network connection."""
     timestamp: float
@@ -21,11 +26,18 @@ class NetworkConnection:
     protocol: str
     status: str
     process_name: str
-    
+    is_suspicious: bool = False
+    # Rendered form, built on first use; the fields never change after
+    # construction and export_report renders each record several times
+    _cached_str: Optional[str] = field(default=None, repr=False)
+
     def __str__(self) -> str:
-        return (f"{time.strftime('%H:%M:%S', time.localtime(self.timestamp))} "
+        if self._cached_str is None:
+            self._cached_str = (
+                f"{time.strftime('%H:%M:%S', time.localtime(self.timestamp))} "
                 f"{self.protocol} {self.local_addr}:{self.local_port} -> "
                 f"{self.remote_addr}:{self.remote_port} [{self.status}]")
+        return self._cached_str
 
 @dataclass
 class NetworkStats:
@@ -41,14 +53,38 @@ class NetworkStats:
 
 class NetworkMonitor:
     """Monitors network traffic for the current process."""
-    
+
+    # Upper bound on remembered (laddr, raddr, status) tuples
+    _KNOWN_CONNECTIONS_MAX = 10000
+
     def __init__(self, log_file: Optional[str] = None):
         self.process = psutil.Process(os.getpid())
         self.monitoring = False
         self.monitor_thread: Optional[threading.Thread] = None
         self.connections: List[NetworkConnection] = []
+        # Category views maintained at ingest so the getters don't
+        # rescan and reclassify the whole connection list
+        self._smtp_list: List[NetworkConnection] = []
+        self._imap_list: List[NetworkConnection] = []
+        self._suspicious_list: List[NetworkConnection] = []
         self.stats = NetworkStats()
-        self.known_connections: Set[str] = set()
+        # Tuple-keyed, insertion-ordered, and bounded: long sessions see
+        # one entry per connection-state transition, so the set must
+        # evict its oldest entries rather than grow forever
+        self.known_connections: "OrderedDict[tuple, None]" = OrderedDict()
+        # ip -> (hostname, resolved_at); repeated connections to the same
+        # remote skip the blocking PTR round-trip
+        self._ptr_cache: Dict[str, Tuple[str, float]] = {}
+        # Connections awaiting detailed logging; the poll loop only
+        # enqueues, so slow PTR lookups never stall the sampling cadence
+        self._log_queue: "queue.Queue[Optional[NetworkConnection]]" = queue.Queue()
+        self._log_thread: Optional[threading.Thread] = None
+        # Both address families: getaddrinfo prefers IPv6 on dual-stack
+        # networks, and a credential-safety monitor that skipped the
+        # IPv6 table would miss those connections entirely
+        self._psutil_kind = 'inet'
+        # Signature of the last sample, to skip reprocessing idle ticks
+        self._last_sample_sig: Optional[tuple] = None
         
         # Setup logging
         if log_file is None:
@@ -63,12 +99,21 @@ class NetworkMonitor:
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
         
-        # File handler for network logs
+        # File handler for network logs, behind a memory buffer so bursts
+        # of connection events cost one write instead of one per event.
+        # The monitor loop flushes it on its 0.5s cadence; warnings
+        # (suspicious connections) flush through immediately.
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s'
         ))
-        self.logger.addHandler(file_handler)
+        self._log_buffer = logging.handlers.MemoryHandler(
+            capacity=256,
+            flushLevel=logging.WARNING,
+            target=file_handler,
+            flushOnClose=True
+        )
+        self.logger.addHandler(self._log_buffer)
         
         self.log_file_path = str(log_file)
         
@@ -83,10 +128,15 @@ class NetworkMonitor:
             "pypi.org",       # Package index (should not happen during runtime)
         ]
         
+        # One alternation regex scans an address for every pattern in a
+        # single pass instead of one substring search per pattern
+        self._suspicious_re = re.compile(
+            '|'.join(re.escape(p) for p in self.suspicious_patterns))
+
         # Expected email/network services
         self.expected_services = {
             25: "SMTP",
-            587: "SMTP-STARTTLS", 
+            587: "SMTP-STARTTLS",
             465: "SMTPS",
             993: "IMAPS",
             143: "IMAP",
@@ -94,6 +144,7 @@ class NetworkMonitor:
             80: "HTTP",
             443: "HTTPS"
         }
+        self._expected_ports = frozenset(self.expected_services)
     
     def start_monitoring(self):
         """Start network monitoring in background thread."""
@@ -103,6 +154,8 @@ class NetworkMonitor:
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
+        self._log_thread = threading.Thread(target=self._log_loop, daemon=True)
+        self._log_thread.start()
         
         self.logger.info("=== NETWORK MONITORING STARTED ===")
         self.logger.info(f"Process PID: {self.process.pid}")
@@ -117,13 +170,18 @@ class NetworkMonitor:
         self.monitoring = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
-        
+        # Drain pending connection logs, then stop the logging thread
+        if self._log_thread:
+            self._log_queue.put(None)
+            self._log_thread.join(timeout=2.0)
+
         self.logger.info("=== NETWORK MONITORING STOPPED ===")
         self.logger.info(f"Total connections monitored: {self.stats.total_connections}")
         self.logger.info(f"SMTP connections: {self.stats.smtp_connections}")
         self.logger.info(f"IMAP connections: {self.stats.imap_connections}")
         self.logger.info(f"DNS queries: {self.stats.dns_queries}")
         self.logger.info(f"Suspicious connections: {self.stats.suspicious_connections}")
+        self._log_buffer.flush()
     
     def _monitor_loop(self):
         """Main monitoring loop."""
@@ -134,20 +192,40 @@ class NetworkMonitor:
                 current_time = time.time()
                 
                 # Get current connections for our process
-                connections = self.process.connections(kind='inet')
-                
+                connections = self.process.connections(kind=self._psutil_kind)
+
+                # Unchanged since the last tick: skip the per-connection
+                # dedup walk entirely. The signature covers every
+                # connection — endpoints and state — so a state flip on
+                # any entry invalidates it
+                sample_sig = tuple(
+                    (c.laddr, c.raddr, c.status) for c in connections)
+                if sample_sig == self._last_sample_sig:
+                    self._log_buffer.flush()
+                    time.sleep(0.5)
+                    continue
+                self._last_sample_sig = sample_sig
+
                 for conn in connections:
                     if conn.status == psutil.CONN_NONE:
                         continue
                     
                     # Create connection identifier
-                    conn_id = f"{conn.laddr}:{conn.raddr}:{conn.status}"
-                    
+                    conn_id = (
+                        conn.laddr.ip if conn.laddr else '',
+                        conn.laddr.port if conn.laddr else 0,
+                        conn.raddr.ip if conn.raddr else '',
+                        conn.raddr.port if conn.raddr else 0,
+                        conn.status
+                    )
+
                     # Skip if we've already logged this connection
                     if conn_id in self.known_connections:
                         continue
-                    
-                    self.known_connections.add(conn_id)
+
+                    self.known_connections[conn_id] = None
+                    if len(self.known_connections) > self._KNOWN_CONNECTIONS_MAX:
+                        self.known_connections.popitem(last=False)
                     
                     # Extract connection details
                     local_addr = conn.laddr.ip if conn.laddr else "unknown"
@@ -176,10 +254,12 @@ class NetworkMonitor:
                     # Categorize connection
                     self._categorize_connection(net_conn, remote_port)
                     
-                    # Log the connection
-                    self._log_connection(net_conn)
+                    # Hand off to the logging thread; PTR resolution
+                    # there must not delay the next poll
+                    self._log_queue.put(net_conn)
                 
-                # Sleep briefly
+                # Flush buffered log records once per pass, then sleep
+                self._log_buffer.flush()
                 time.sleep(0.5)
                 
             except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -192,19 +272,23 @@ class NetworkMonitor:
         """Categorize the type of connection."""
         if remote_port in [25, 587, 465, 2525]:
             self.stats.smtp_connections += 1
+            self._smtp_list.append(conn)
             self.logger.info(f"SMTP CONNECTION: {conn}")
         elif remote_port in [993, 143]:
             self.stats.imap_connections += 1
+            self._imap_list.append(conn)
             self.logger.info(f"IMAP CONNECTION: {conn}")
         elif remote_port == 53:
             self.stats.dns_queries += 1
             self.logger.info(f"DNS QUERY: {conn}")
         else:
             self.stats.other_connections += 1
-            
-            # Check for suspicious connections
-            if self._is_suspicious_connection(conn):
+
+            # Classify once at ingest; the getters reuse the result
+            conn.is_suspicious = self._is_suspicious_connection(conn)
+            if conn.is_suspicious:
                 self.stats.suspicious_connections += 1
+                self._suspicious_list.append(conn)
                 self.logger.warning(f"SUSPICIOUS CONNECTION: {conn}")
             else:
                 self.logger.info(f"OTHER CONNECTION: {conn}")
@@ -212,30 +296,54 @@ class NetworkMonitor:
     def _is_suspicious_connection(self, conn: NetworkConnection) -> bool:
         """Check if a connection looks suspicious."""
         # Check remote address for suspicious patterns
-        remote_lower = conn.remote_addr.lower()
-        
-        for pattern in self.suspicious_patterns:
-            if pattern in remote_lower:
-                return True
-        
+        if self._suspicious_re.search(conn.remote_addr.lower()):
+            return True
+
         # Check for unexpected ports
-        if conn.remote_port not in self.expected_services:
+        if conn.remote_port not in self._expected_ports:
             # High ports might be suspicious for unexpected outbound connections
             if conn.remote_port > 8000 and conn.remote_port != 8080 and conn.remote_port != 8443:
                 return True
         
         return False
     
-    def _log_connection(self, conn: NetworkConnection):
-        """Log a connection with detailed information."""
-        service_name = self.expected_services.get(conn.remote_port, "UNKNOWN")
-        
-        # Try to resolve hostname
+    def _log_loop(self):
+        """Consume queued connections and log them with reverse DNS."""
+        while True:
+            conn = self._log_queue.get()
+            if conn is None:
+                break
+            try:
+                self._log_connection(conn)
+            except Exception as e:
+                self.logger.error(f"Error logging connection: {e}")
+
+    # Reverse-DNS answers (including failures) are reused for this long
+    _PTR_CACHE_TTL = 900.0
+    _PTR_CACHE_MAX = 1024
+
+    def _resolve_ptr(self, remote_addr: str) -> str:
+        """Reverse-resolve an address, caching answers and failures."""
+        entry = self._ptr_cache.get(remote_addr)
+        if entry is not None and time.time() - entry[1] < self._PTR_CACHE_TTL:
+            return entry[0]
+
         hostname = "unknown"
         try:
-            hostname = socket.gethostbyaddr(conn.remote_addr)[0]
+            hostname = socket.gethostbyaddr(remote_addr)[0]
         except (socket.herror, socket.gaierror):
             pass
+
+        if len(self._ptr_cache) >= self._PTR_CACHE_MAX:
+            self._ptr_cache.clear()
+        self._ptr_cache[remote_addr] = (hostname, time.time())
+        return hostname
+
+    def _log_connection(self, conn: NetworkConnection):
+        """Log a connection with detailed information."""
+        service_name = self.expected_services.get(conn.remote_port, "UNKNOWN")
+
+        hostname = self._resolve_ptr(conn.remote_addr)
         
         log_msg = (f"CONNECTION: {conn.protocol} "
                   f"{conn.local_addr}:{conn.local_port} -> "
@@ -253,21 +361,15 @@ class NetworkMonitor:
     
     def get_smtp_connections(self) -> List[NetworkConnection]:
         """Get all SMTP connections."""
-        return [conn for conn in self.connections 
-                if conn.remote_port in [25, 587, 465, 2525]]
-    
+        return list(self._smtp_list)
+
     def get_imap_connections(self) -> List[NetworkConnection]:
         """Get all IMAP connections."""
-        return [conn for conn in self.connections 
-                if conn.remote_port in [993, 143]]
-    
+        return list(self._imap_list)
+
     def get_suspicious_connections(self) -> List[NetworkConnection]:
         """Get all connections flagged as suspicious."""
-        suspicious = []
-        for conn in self.connections:
-            if self._is_suspicious_connection(conn):
-                suspicious.append(conn)
-        return suspicious
+        return list(self._suspicious_list)
     
     def get_stats_summary(self) -> str:
         """Get a summary of network monitoring statistics."""
@@ -297,24 +399,23 @@ class NetworkMonitor:
             f.write(f"Other connections: {self.stats.other_connections}\n")
             f.write(f"Suspicious connections: {self.stats.suspicious_connections}\n\n")
             
+            # Stream each section straight from the category lists;
+            # writelines consumes the generators without building
+            # intermediate lists
             f.write("=== EMAIL SERVER CONNECTIONS ===\n")
-            email_conns = self.get_smtp_connections() + self.get_imap_connections()
-            for conn in email_conns:
-                f.write(f"{conn}\n")
-            
-            if not email_conns:
+            f.writelines(f"{conn}\n" for conn in
+                         chain(self._smtp_list, self._imap_list))
+
+            if not self._smtp_list and not self._imap_list:
                 f.write("No email server connections detected.\n")
-            
+
             f.write("\n=== SUSPICIOUS CONNECTIONS ===\n")
-            suspicious = self.get_suspicious_connections()
-            for conn in suspicious:
-                f.write(f"{conn}\n")
-            
-            if not suspicious:
+            f.writelines(f"{conn}\n" for conn in self._suspicious_list)
+
+            if not self._suspicious_list:
                 f.write("No suspicious connections detected.\n")
-            
+
             f.write("\n=== ALL CONNECTIONS ===\n")
-            for conn in self.connections:
-                f.write(f"{conn}\n")
+            f.writelines(f"{conn}\n" for conn in self.connections)
         
         return str(output_file)
\ No newline at end of file
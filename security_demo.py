@@ -1,10 +1,66 @@
 #!/usr/bin/env python3
 """Demo script to show network monitoring in action."""
 
-import time
+import asyncio
 import socket
+import time
 from network_monitor import NetworkMonitor
 
+# Endpoints the demo probes; all run concurrently
+PROBE_TARGETS = [
+    ("smtp.gmail.com", 587),
+    ("smtp.gmail.com", 465),
+]
+
+# host -> (address, expiry). A short TTL is enough to stop repeat probes
+# in one process from re-resolving the same name
+_DNS_CACHE = {}
+_DNS_TTL = 60.0
+
+async def _resolve(host: str):
+    """Resolve a hostname, returning the first address or None.
+
+    Successful lookups are cached for _DNS_TTL seconds.
+    """
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(host)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except OSError:
+        return None
+    address = infos[0][4][0]
+    _DNS_CACHE[host] = (address, now + _DNS_TTL)
+    return address
+
+async def _probe(host: str, port: int) -> bool:
+    """True if a TCP connection to host:port succeeds within 5s."""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), 5)
+        writer.close()
+        await writer.wait_closed()
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+async def _run_probes():
+    """Fire the DNS lookup and all port probes in one gather.
+
+    Wall time is the slowest single probe rather than the old serial
+    lookup → sleep → connect walk; the NetworkMonitor timestamps every
+    connection, so no pacing is needed to keep the log readable.
+    """
+    # Resolve the probe host once up front; the port probes then connect
+    # straight to the cached address instead of re-resolving per port
+    lookup_addr, smtp_addr = await asyncio.gather(
+        _resolve("gmail.com"), _resolve(PROBE_TARGETS[0][0]))
+    probes = await asyncio.gather(
+        *(_probe(smtp_addr or host, port) for host, port in PROBE_TARGETS))
+    return lookup_addr, list(zip(PROBE_TARGETS, probes))
+
 def main():
     print("=== NETWORK MONITORING SECURITY DEMO ===")
     print("This demo shows how the tool monitors network connections")
@@ -17,35 +73,22 @@ def main():
     print(f"✓ Network monitoring started")
     print(f"✓ Log file: {monitor.log_file_path}")
     print("\nMaking some test connections...\n")
-    
-    # Test 1: Normal DNS lookup
-    print("1. Testing DNS lookup (normal behavior)...")
-    try:
-        socket.gethostbyname("gmail.com")
-        print("   ✓ DNS lookup completed")
-    except:
+
+    # Tests 1+2: DNS lookup and SMTP port probes, all concurrent
+    print("1. Testing DNS lookup and SMTP port connections...")
+    address, probe_results = asyncio.run(_run_probes())
+    if address:
+        print(f"   ✓ DNS lookup completed ({address})")
+    else:
         print("   ✗ DNS lookup failed")
-    
-    time.sleep(1)
-    
-    # Test 2: Test SMTP port connection
-    print("2. Testing SMTP port connection...")
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5)
-        result = sock.connect_ex(("smtp.gmail.com", 587))
-        sock.close()
-        if result == 0:
-            print("   ✓ SMTP port 587 reachable")
+    for (host, port), reachable in probe_results:
+        if reachable:
+            print(f"   ✓ SMTP port {port} reachable on {host}")
         else:
-            print("   ⚠ SMTP port 587 unreachable")
-    except Exception as e:
-        print(f"   ✗ SMTP test failed: {e}")
-    
-    time.sleep(1)
-    
+            print(f"   ⚠ SMTP port {port} unreachable on {host}")
+
     # Test 3: Check what we captured
-    print("3. Analyzing captured network traffic...")
+    print("2. Analyzing captured network traffic...")
     
     # Stop monitoring
     monitor.stop_monitoring()
@@ -1,19 +1,78 @@
 """Enhanced SMTP client with comprehensive debugging and ISP interference detection."""
 
+import base64
+import mmap
+import re
 import smtplib
 import ssl
 import socket
+import tempfile
 import time
 import logging
+import uuid
 from typing import Optional, List, Dict, Any, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from email import policy
+from email.generator import BytesGenerator
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 import os
 
-@dataclass
+# Attachment bytes per streamed chunk: a multiple of 57 so every chunk
+# base64-encodes to whole 76-character lines with no carry between chunks
+_STREAM_CHUNK = 57 * 1024
+# The same window on the encoded side: 57 raw bytes become one
+# 76-char line plus CRLF, so slices stay line-aligned
+_STREAM_CHUNK_B64 = _STREAM_CHUNK // 57 * 78
+
+# send_test_email flattens into a spool that stays in memory up to this
+# size and spills to disk beyond it; spilled messages stream to the
+# socket in _SPOOL_CHUNK pieces instead of materializing as one object
+_SPOOL_MAX = 1 << 20
+_SPOOL_CHUNK = 64 * 1024
+
+# MIME chunks gathered into one sendmsg() call on the streaming path.
+# sendmsg turns the batch into a single writev-style syscall, collapsing
+# one write per chunk into one per batch; 64 entries stays well under
+# IOV_MAX while amortizing the syscall over several MB of base64.
+_WRITEV_BATCH = 64
+
+def _b64_wrap(data, newline: bytes = b'\n') -> bytes:
+    """Base64-encode data in one binascii call, wrapped at 76 columns.
+
+    Produces the same output as base64.encodebytes, which feeds the
+    input to binascii in 57-byte slices; encoding the whole buffer in
+    one call and wrapping the result afterwards measures modestly
+    faster on multi-megabyte attachments, and also lets the streaming
+    path pick its own line terminator instead of rewriting b'\n'.
+    """
+    encoded = base64.b64encode(data)
+    if not encoded:
+        return b''
+    return newline.join(
+        [encoded[i:i + 76] for i in range(0, len(encoded), 76)]) + newline
+
+class _LazyError:
+    """Deferred error record.
+
+    Holds the exception by reference and renders "context: exc" only
+    when actually read, so exception paths never format strings that
+    nothing displays.
+    """
+    __slots__ = ('context', 'exc', '_str')
+
+    def __init__(self, context: str, exc: BaseException):
+        self.context = context
+        self.exc = exc
+        self._str: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._str is None:
+            self._str = f"{self.context}: {self.exc}"
+        return self._str
+
+@dataclass(slots=True)
 class SMTPStats:
     """Statistics for SMTP operations."""
     connection_time: float = 0.0
@@ -22,85 +81,203 @@ class SMTPStats:
     total_time: float = 0.0
     bytes_sent: int = 0
     chunks_sent: int = 0
-    errors: List[str] = None
+    errors: List[Any] = None  # str or _LazyError; render with str()
     warnings: List[str] = None
-    
+
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
         if self.warnings is None:
             self.warnings = []
 
-@dataclass
+    def record_error(self, context: str, exc: BaseException):
+        """Append an error without paying for its formatting up front."""
+        self.errors.append(_LazyError(context, exc))
+
+    @property
+    def formatted_errors(self) -> List[str]:
+        """All recorded errors as strings, for reports."""
+        return [str(e) for e in self.errors]
+
+@dataclass(slots=True)
 class SMTPLogEntry:
-    """Single SMTP protocol log entry."""
+    """Single SMTP protocol log entry.
+
+    Allocated per protocol line, so slots matter: no per-instance dict
+    and the fast descriptor path for attribute reads.
+    """
     timestamp: float
     direction: str  # '→' for outgoing, '←' for incoming
-    data: str
+    data: Any  # str, or wire bytes decoded lazily via data_str
     is_error: bool = False
     timing_info: Optional[str] = None
+    # Render caches filled in by the dashboard at ingestion
+    _formatted_ts: Optional[str] = field(default=None, repr=False)
+    _rendered: Optional[Any] = field(default=None, repr=False)
 
-class DebugSMTP(smtplib.SMTP):
-    """Enhanced SMTP client with detailed logging and debugging."""
-    
-    def __init__(self, host='', port=0, local_hostname=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, 
-                 source_address=None, log_callback: Optional[Callable[[SMTPLogEntry], None]] = None):
+    @property
+    def data_str(self) -> str:
+        """The log line as text.
+
+        Wire bytes are decoded (and their line terminator trimmed) on
+        first access and cached back into data, so entries that are
+        never rendered never pay the decode.
+        """
+        data = self.data
+        if isinstance(data, bytes):
+            data = data.decode('ascii', errors='replace').strip()
+            self.data = data
+        return data
+
+# Protocol log capacity. Power of two so ring indexing is a mask.
+_LOG_RING_SIZE = 1024
+
+class ProtocolLogRing:
+    """Fixed-capacity ring of raw protocol log records.
+
+    The hot path writes plain tuples (in SMTPLogEntry field order) with
+    free-running head/tail offsets, so logging a line never allocates a
+    dataclass or grows a list; once full, the oldest records are simply
+    overwritten. Records materialize as SMTPLogEntry objects only when
+    entries() is called.
+    """
+    __slots__ = ('_slots', '_head', '_tail')
+
+    def __init__(self, size: int = _LOG_RING_SIZE):
+        # Mask indexing needs a power-of-two capacity; round up so any
+        # requested size holds at least that many records
+        if size <= 0:
+            raise ValueError("ring size must be positive")
+        size = 1 << (size - 1).bit_length()
+        self._slots: List[Optional[tuple]] = [None] * size
+        self._head = 0  # next write offset (free-running)
+        self._tail = 0  # oldest retained record (free-running)
+
+    def append(self, record: tuple):
+        slots = self._slots
+        head = self._head
+        slots[head & (len(slots) - 1)] = record
+        self._head = head + 1
+        if self._head - self._tail > len(slots):
+            self._tail = self._head - len(slots)
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def entries(self) -> List[SMTPLogEntry]:
+        """Materialize the retained records, oldest first."""
+        mask = len(self._slots) - 1
+        return [SMTPLogEntry(*self._slots[i & mask])
+                for i in range(self._tail, self._head)]
+
+    def clear(self):
+        self._tail = self._head
+
+def batched_log_adapter(callback: Callable[[SMTPLogEntry], None]) -> Callable[[List[SMTPLogEntry]], None]:
+    """Adapt a per-entry log callback to the batched callback signature."""
+    def deliver(entries: List[SMTPLogEntry]):
+        for entry in entries:
+            callback(entry)
+    return deliver
+
+class _DebugSMTPMixin:
+    """Shared logging and timing behavior for the debug SMTP classes.
+
+    Defined once at module scope so connecting doesn't re-execute a
+    class body per call; the SSL variant only overrides the connect
+    messages via the class attributes below.
+    """
+
+    _connecting_fmt = "Connecting to {host}:{port}..."
+    _connected_msg = "Connected successfully"
+    _connect_fail_prefix = "Connection failed"
+
+    def _init_debug_state(self, log_callback: Optional[Callable[[List[SMTPLogEntry]], None]],
+                          log_batch_size: int):
+        """Set up logging state; must run before smtplib's __init__."""
         self.log_callback = log_callback
-        self.protocol_log: List[SMTPLogEntry] = []
+        self.log_batch_size = log_batch_size
+        self.protocol_log = ProtocolLogRing()
+        self._pending: List[SMTPLogEntry] = []
         self.stats = SMTPStats()
-        self.connection_start_time = 0.0
-        self.last_command_time = 0.0
-        
-        super().__init__(host, port, local_hostname, timeout, source_address)
-    
-    def _log_entry(self, direction: str, data: str, is_error: bool = False, timing_info: Optional[str] = None):
-        """Log a protocol entry."""
-        entry = SMTPLogEntry(
-            timestamp=time.time(),
-            direction=direction,
-            data=data.strip(),
-            is_error=is_error,
-            timing_info=timing_info
-        )
-        self.protocol_log.append(entry)
-        
-        if self.log_callback:
-            self.log_callback(entry)
+        # Timers run on monotonic_ns ints: cheaper to read than
+        # time.time() and immune to clock steps. One wall/monotonic
+        # anchor pair reconstructs epoch timestamps for log entries.
+        self.connection_start_time = 0
+        self.last_command_time = 0
+        self._wall_anchor = time.time()
+        self._mono_anchor = time.monotonic_ns()
+        # True only while login() is on the wire; send() limits its
+        # credential-redaction scan to that window
+        self._in_auth = False
+
+    def _log_entry(self, direction: str, data, is_error: bool = False,
+                   timing_info: Optional[str] = None, clean: bool = False):
+        """Log a protocol entry.
+
+        data may be str or raw wire bytes; bytes are stored as-is and
+        decoded lazily by SMTPLogEntry.data_str. clean=True skips the
+        strip() for call sites passing known-clean fixed strings.
+        """
+        timestamp = self._wall_anchor + (time.monotonic_ns() - self._mono_anchor) * 1e-9
+        if not clean and isinstance(data, str):
+            data = data.strip()
+        record = (timestamp, direction, data, is_error, timing_info)
+        self.protocol_log.append(record)
+
+        if self.log_callback is None:
+            return
+        # Batch callback delivery so the state machine isn't stalled by
+        # a render per protocol line; errors flush immediately
+        self._pending.append(SMTPLogEntry(*record))
+        if is_error or len(self._pending) >= self.log_batch_size:
+            self._flush_log()
+
+    def _flush_log(self):
+        """Deliver any pending log entries to the callback in one batch."""
+        if self._pending and self.log_callback:
+            batch = self._pending
+            self._pending = []
+            self.log_callback(batch)
     
     def connect(self, host='localhost', port=0):
         """Connect with timing and detailed logging."""
-        self.connection_start_time = time.time()
-        self._log_entry("→", f"Connecting to {host}:{port}...")
-        
+        self.connection_start_time = time.monotonic_ns()
+        self._log_entry("→", self._connecting_fmt.format(host=host, port=port), clean=True)
+
         try:
             result = super().connect(host, port)
-            self.stats.connection_time = time.time() - self.connection_start_time
-            self._log_entry("←", f"Connected successfully", timing_info=f"{self.stats.connection_time:.3f}s")
+            self.stats.connection_time = (time.monotonic_ns() - self.connection_start_time) * 1e-9
+            self._log_entry("←", self._connected_msg, timing_info=f"{self.stats.connection_time:.3f}s", clean=True)
             return result
         except Exception as e:
-            self.stats.errors.append(f"Connection failed: {str(e)}")
-            self._log_entry("←", f"Connection failed: {str(e)}", is_error=True)
+            self.stats.record_error(self._connect_fail_prefix, e)
+            self._log_entry("←", f"{self._connect_fail_prefix}: {str(e)}", is_error=True)
             raise
     
     def send(self, s):
         """Override send to log all outgoing data."""
         if isinstance(s, str):
             s = s.encode('ascii')
-        
-        # Log the command (sanitize passwords)
-        log_data = s.decode('ascii', errors='replace')
-        if 'AUTH PLAIN' in log_data or 'AUTH LOGIN' in log_data:
-            log_data = log_data.split()[0] + " [CREDENTIALS HIDDEN]"
-        
-        self.last_command_time = time.time()
-        self._log_entry("→", log_data)
-        
+
+        # Sanitize passwords. AUTH only happens inside login(), so DATA
+        # chunks never pay the substring scan; the byte-prefix check
+        # keeps even auth-window EHLO lines cheap. Everything else is
+        # logged as raw wire bytes, decoded only if actually rendered
+        if self._in_auth and len(s) < 256 and s[:4].upper() == b'AUTH':
+            log_data = s.decode('ascii', errors='replace').split()[0] + " [CREDENTIALS HIDDEN]"
+        else:
+            log_data = s
+
+        self.last_command_time = time.monotonic_ns()
+        self._log_entry("→", log_data, clean=True)
+
         try:
             result = super().send(s)
             self.stats.bytes_sent += len(s)
             return result
         except Exception as e:
-            self.stats.errors.append(f"Send failed: {str(e)}")
+            self.stats.record_error("Send failed", e)
             self._log_entry("←", f"Send failed: {str(e)}", is_error=True)
             raise
     
@@ -108,33 +285,39 @@ class DebugSMTP(smtplib.SMTP):
         """Override getreply to log all incoming data."""
         try:
             code, msg = super().getreply()
-            response_time = time.time() - self.last_command_time
+            response_time = (time.monotonic_ns() - self.last_command_time) * 1e-9
             timing_info = f"{response_time:.3f}s" if response_time > 0.001 else None
-            
-            full_response = f"{code} {msg.decode('ascii', errors='replace') if isinstance(msg, bytes) else msg}"
-            self._log_entry("←", full_response, timing_info=timing_info)
-            
+
+            # Keep the reply as bytes; data_str decodes it if rendered
+            if isinstance(msg, bytes):
+                full_response = b'%d %s' % (code, msg)
+            else:
+                full_response = f"{code} {msg}"
+            self._log_entry("←", full_response, timing_info=timing_info, clean=True)
+            # A reply closes a round trip: good point to drain the batch
+            self._flush_log()
+
             # Check for potential ISP interference indicators
             if code >= 400:
-                if "timeout" in msg.lower() or "connection" in msg.lower():
+                if b"timeout" in msg.lower() or b"connection" in msg.lower():
                     self.stats.warnings.append("Potential ISP connection interference detected")
-                elif "size" in msg.lower() or "limit" in msg.lower():
+                elif b"size" in msg.lower() or b"limit" in msg.lower():
                     self.stats.warnings.append("Server size limit reached")
             
             return code, msg
         except Exception as e:
-            self.stats.errors.append(f"Response failed: {str(e)}")
+            self.stats.record_error("Response failed", e)
             self._log_entry("←", f"Response failed: {str(e)}", is_error=True)
             raise
     
     def starttls(self, keyfile=None, certfile=None, context=None):
         """Start TLS with enhanced logging."""
-        self._log_entry("→", "STARTTLS")
-        tls_start = time.time()
-        
+        self._log_entry("→", "STARTTLS", clean=True)
+        tls_start = time.monotonic_ns()
+
         try:
             result = super().starttls(keyfile, certfile, context)
-            tls_time = time.time() - tls_start
+            tls_time = (time.monotonic_ns() - tls_start) * 1e-9
             
             # Get TLS information
             if hasattr(self.sock, 'cipher'):
@@ -151,52 +334,55 @@ class DebugSMTP(smtplib.SMTP):
                 
             return result
         except Exception as e:
-            self.stats.errors.append(f"TLS failed: {str(e)}")
+            self.stats.record_error("TLS failed", e)
             self._log_entry("←", f"TLS failed: {str(e)}", is_error=True)
             raise
     
     def login(self, user, password):
         """Login with timing."""
-        auth_start = time.time()
+        auth_start = time.monotonic_ns()
+        self._in_auth = True
         try:
             result = super().login(user, password)
-            self.stats.auth_time = time.time() - auth_start
+            self.stats.auth_time = (time.monotonic_ns() - auth_start) * 1e-9
             self._log_entry("←", f"Authentication successful", timing_info=f"{self.stats.auth_time:.3f}s")
             return result
         except Exception as e:
-            self.stats.errors.append(f"Authentication failed: {str(e)}")
+            self.stats.record_error("Authentication failed", e)
             self._log_entry("←", f"Authentication failed: {str(e)}", is_error=True)
             raise
+        finally:
+            self._in_auth = False
     
     def data(self, msg):
         """Send email data with chunk monitoring."""
-        send_start = time.time()
-        self._log_entry("→", "DATA")
-        
+        send_start = time.monotonic_ns()
+        self._log_entry("→", "DATA", clean=True)
+
         try:
-            # Monitor chunked sending for large messages
-            if len(msg) > 1024 * 1024:  # 1MB threshold
-                self._log_entry("→", f"Large message detected: {len(msg):,} bytes")
-                chunk_size = 8192
-                total_chunks = (len(msg) + chunk_size - 1) // chunk_size
-                self.stats.chunks_sent = total_chunks
-                self._log_entry("→", f"Will send in {total_chunks} chunks of {chunk_size} bytes")
-            
             result = super().data(msg)
-            
-            self.stats.send_time = time.time() - send_start
-            self._log_entry("←", f"Message sent successfully", timing_info=f"{self.stats.send_time:.3f}s")
-            
+
+            # The socket layer already writes TCP-sized chunks; the one
+            # useful number to log is the achieved throughput
+            self.stats.send_time = (time.monotonic_ns() - send_start) * 1e-9
+            if self.stats.send_time > 0:
+                rate = len(msg) / self.stats.send_time / (1024 * 1024)
+                sent_msg = f"Message sent: {len(msg):,} bytes at {rate:.2f} MB/s"
+            else:
+                sent_msg = f"Message sent: {len(msg):,} bytes"
+            self._log_entry("←", sent_msg,
+                            timing_info=f"{self.stats.send_time:.3f}s", clean=True)
+
             return result
         except Exception as e:
-            self.stats.errors.append(f"Data send failed: {str(e)}")
+            self.stats.record_error("Data send failed", e)
             self._log_entry("←", f"Data send failed: {str(e)}", is_error=True)
             raise
     
     def quit(self):
         """Quit with timing summary."""
-        self.stats.total_time = time.time() - self.connection_start_time
-        self._log_entry("→", "QUIT")
+        self.stats.total_time = (time.monotonic_ns() - self.connection_start_time) * 1e-9
+        self._log_entry("→", "QUIT", clean=True)
         try:
             result = super().quit()
             self._log_entry("←", f"Session ended. Total time: {self.stats.total_time:.3f}s")
@@ -204,16 +390,48 @@ class DebugSMTP(smtplib.SMTP):
         except Exception as e:
             self._log_entry("←", f"Quit failed: {str(e)}", is_error=True)
             raise
+        finally:
+            self._flush_log()
+
+class DebugSMTP(_DebugSMTPMixin, smtplib.SMTP):
+    """Enhanced SMTP client with detailed logging and debugging."""
+
+    def __init__(self, host='', port=0, local_hostname=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                 source_address=None, log_callback: Optional[Callable[[List[SMTPLogEntry]], None]] = None,
+                 log_batch_size: int = 32):
+        self._init_debug_state(log_callback, log_batch_size)
+        super().__init__(host, port, local_hostname, timeout, source_address)
+
+class DebugSMTP_SSL(_DebugSMTPMixin, smtplib.SMTP_SSL):
+    """SSL-from-the-start variant for SMTPS (port 465)."""
+
+    _connecting_fmt = "Connecting to {host}:{port} (SSL)..."
+    _connected_msg = "SSL connection established"
+    _connect_fail_prefix = "SSL connection failed"
+
+    def __init__(self, host='', port=0, local_hostname=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                 log_callback: Optional[Callable[[List[SMTPLogEntry]], None]] = None,
+                 log_batch_size: int = 32):
+        self._init_debug_state(log_callback, log_batch_size)
+        super().__init__(host, port, local_hostname, timeout=timeout)
 
 class SMTPDebugger:
     """High-level SMTP debugging interface."""
     
-    def __init__(self, host: str, port: int, use_tls: bool = True, 
+    def __init__(self, host: str, port: int, use_tls: bool = True,
                  log_callback: Optional[Callable[[SMTPLogEntry], None]] = None):
         self.host = host
         self.port = port
         self.use_tls = use_tls
         self.log_callback = log_callback
+        # The debug SMTP classes deliver entries in batches; adapt the
+        # per-entry callback once here
+        self._batch_callback = batched_log_adapter(log_callback) if log_callback else None
+        # Repeated probe sends reuse the same generated test files, so
+        # the wire-ready base64 payload is cached per path, invalidated
+        # by mtime/size and shared by the buffered and streaming send
+        # paths; bounded since the tool only juggles a few files
+        self._att_cache: Dict[str, Tuple[float, int, bytes]] = {}
         self.smtp: Optional[DebugSMTP] = None
     
     def connect_and_auth(self, username: str, password: str) -> SMTPStats:
@@ -223,123 +441,16 @@ class SMTPDebugger:
             # For port 465, use SMTP_SSL. For other ports, use SMTP with optional STARTTLS
             if self.port == 465:
                 # SMTPS - SSL from the start
-                class DebugSMTP_SSL(smtplib.SMTP_SSL):
-                    def __init__(self, host='', port=0, local_hostname=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
-                        self.log_callback = None
-                        self.protocol_log = []
-                        self.stats = SMTPStats()
-                        self.connection_start_time = 0.0
-                        self.last_command_time = 0.0
-                        super().__init__(host, port, local_hostname, timeout=timeout)
-                    
-                    def _log_entry(self, direction, data, is_error=False, timing_info=None):
-                        entry = SMTPLogEntry(
-                            timestamp=time.time(),
-                            direction=direction,
-                            data=data.strip(),
-                            is_error=is_error,
-                            timing_info=timing_info
-                        )
-                        self.protocol_log.append(entry)
-                        if self.log_callback:
-                            self.log_callback(entry)
-                    
-                    def connect(self, host='localhost', port=0):
-                        self.connection_start_time = time.time()
-                        self._log_entry("→", f"Connecting to {host}:{port} (SSL)...")
-                        try:
-                            result = super().connect(host, port)
-                            self.stats.connection_time = time.time() - self.connection_start_time
-                            self._log_entry("←", f"SSL connection established", timing_info=f"{self.stats.connection_time:.3f}s")
-                            return result
-                        except Exception as e:
-                            self.stats.errors.append(f"SSL connection failed: {str(e)}")
-                            self._log_entry("←", f"SSL connection failed: {str(e)}", is_error=True)
-                            raise
-                    
-                    def send(self, s):
-                        if isinstance(s, str):
-                            s = s.encode('ascii')
-                        log_data = s.decode('ascii', errors='replace')
-                        if 'AUTH PLAIN' in log_data or 'AUTH LOGIN' in log_data:
-                            log_data = log_data.split()[0] + " [CREDENTIALS HIDDEN]"
-                        self.last_command_time = time.time()
-                        self._log_entry("→", log_data)
-                        try:
-                            result = super().send(s)
-                            self.stats.bytes_sent += len(s)
-                            return result
-                        except Exception as e:
-                            self.stats.errors.append(f"Send failed: {str(e)}")
-                            self._log_entry("←", f"Send failed: {str(e)}", is_error=True)
-                            raise
-                    
-                    def getreply(self):
-                        try:
-                            code, msg = super().getreply()
-                            response_time = time.time() - self.last_command_time
-                            timing_info = f"{response_time:.3f}s" if response_time > 0.001 else None
-                            full_response = f"{code} {msg.decode('ascii', errors='replace') if isinstance(msg, bytes) else msg}"
-                            self._log_entry("←", full_response, timing_info=timing_info)
-                            return code, msg
-                        except Exception as e:
-                            self.stats.errors.append(f"Response failed: {str(e)}")
-                            self._log_entry("←", f"Response failed: {str(e)}", is_error=True)
-                            raise
-                    
-                    def login(self, user, password):
-                        auth_start = time.time()
-                        try:
-                            result = super().login(user, password)
-                            self.stats.auth_time = time.time() - auth_start
-                            self._log_entry("←", f"Authentication successful", timing_info=f"{self.stats.auth_time:.3f}s")
-                            return result
-                        except Exception as e:
-                            self.stats.errors.append(f"Authentication failed: {str(e)}")
-                            self._log_entry("←", f"Authentication failed: {str(e)}", is_error=True)
-                            raise
-                    
-                    def data(self, msg):
-                        send_start = time.time()
-                        self._log_entry("→", "DATA")
-                        try:
-                            if len(msg) > 1024 * 1024:  # 1MB threshold
-                                self._log_entry("→", f"Large message detected: {len(msg):,} bytes")
-                                chunk_size = 8192
-                                total_chunks = (len(msg) + chunk_size - 1) // chunk_size
-                                self.stats.chunks_sent = total_chunks
-                                self._log_entry("→", f"Will send in {total_chunks} chunks of {chunk_size} bytes")
-                            
-                            result = super().data(msg)
-                            self.stats.send_time = time.time() - send_start
-                            self._log_entry("←", f"Message sent successfully", timing_info=f"{self.stats.send_time:.3f}s")
-                            return result
-                        except Exception as e:
-                            self.stats.errors.append(f"Data send failed: {str(e)}")
-                            self._log_entry("←", f"Data send failed: {str(e)}", is_error=True)
-                            raise
-                    
-                    def quit(self):
-                        self.stats.total_time = time.time() - self.connection_start_time
-                        self._log_entry("→", "QUIT")
-                        try:
-                            result = super().quit()
-                            self._log_entry("←", f"Session ended. Total time: {self.stats.total_time:.3f}s")
-                            return result
-                        except Exception as e:
-                            self._log_entry("←", f"Quit failed: {str(e)}", is_error=True)
-                            raise
-                
                 self.smtp = DebugSMTP_SSL(
-                    host=self.host, 
+                    host=self.host,
                     port=self.port,
-                    timeout=30
+                    timeout=30,
+                    log_callback=self._batch_callback
                 )
-                self.smtp.log_callback = self.log_callback
                 self.smtp.ehlo()
             else:
                 # Standard SMTP with optional STARTTLS
-                self.smtp = DebugSMTP(log_callback=self.log_callback, timeout=30)
+                self.smtp = DebugSMTP(log_callback=self._batch_callback, timeout=30)
                 self.smtp.connect(self.host, self.port)
                 self.smtp.ehlo()
                 
@@ -352,11 +463,34 @@ class SMTPDebugger:
             
         except Exception as e:
             if self.smtp:
-                self.smtp.stats.errors.append(f"Connection/auth failed: {str(e)}")
+                self.smtp.stats.record_error("Connection/auth failed", e)
                 return self.smtp.stats
             raise
     
-    def send_test_email(self, from_addr: str, to_addr: str, subject: str, 
+    def _encoded_attachment(self, attachment_path: str) -> bytes:
+        """CRLF-lined base64 of a file, cached across repeat sends.
+
+        Keyed by (mtime, size) so an edited file re-encodes; both the
+        buffered and streaming send paths read from this one cache. The
+        encode runs straight out of the page cache via mmap, with no
+        bytes copy of the raw file.
+        """
+        st = os.stat(attachment_path)
+        cached = self._att_cache.get(attachment_path)
+        if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            return cached[2]
+        if st.st_size:
+            with open(attachment_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                payload = _b64_wrap(mm, b'\r\n')
+        else:
+            payload = b''
+        if len(self._att_cache) >= 8:
+            self._att_cache.clear()
+        self._att_cache[attachment_path] = (st.st_mtime, st.st_size, payload)
+        return payload
+
+    def send_test_email(self, from_addr: str, to_addr: str, subject: str,
                        body: str, attachments: Optional[List[str]] = None) -> SMTPStats:
         """Send a test email with detailed monitoring."""
         if not self.smtp:
@@ -378,21 +512,27 @@ class SMTPDebugger:
         if attachments:
             for attachment_path in attachments:
                 if os.path.exists(attachment_path):
-                    with open(attachment_path, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {os.path.basename(attachment_path)}'
-                        )
-                        msg.attach(part)
-                        original_size += os.path.getsize(attachment_path)
-        
-        # Get final message
-        message_text = msg.as_string()
-        final_size = len(message_text)
+                    part = MIMEBase('application', 'octet-stream')
+                    # CRLF-lined base64 flattens identically to LF under
+                    # policy.SMTP, so the wire-ready cache bytes can be
+                    # set directly
+                    payload = self._encoded_attachment(attachment_path)
+                    part.set_payload(payload.decode('ascii'))
+                    part['Content-Transfer-Encoding'] = 'base64'
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {os.path.basename(attachment_path)}'
+                    )
+                    msg.attach(part)
+                    original_size += os.path.getsize(attachment_path)
         
+        # Flatten once into a spool that spills to disk past _SPOOL_MAX,
+        # so the full message never exists as a single Python string
+        # the way msg.as_string() would build it
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX)
+        BytesGenerator(spool, policy=policy.SMTP).flatten(msg)
+        final_size = spool.tell()
+
         # Log size information
         if self.log_callback:
             size_entry = SMTPLogEntry(
@@ -401,15 +541,183 @@ class SMTPDebugger:
                 data=f"Message size: {original_size:,} bytes → {final_size:,} bytes (overhead: +{((final_size/original_size-1)*100):.1f}%)"
             )
             self.log_callback(size_entry)
-        
+
         # Send the email
         try:
-            self.smtp.send_message(msg, from_addr, [to_addr])
+            with spool:
+                if final_size <= _SPOOL_MAX:
+                    # Still in memory: hand smtplib the bytes directly
+                    spool.seek(0)
+                    self.smtp.sendmail(from_addr, [to_addr], spool.read())
+                else:
+                    self._send_spooled(from_addr, to_addr, spool)
             return self.smtp.stats
         except Exception as e:
-            self.smtp.stats.errors.append(f"Send failed: {str(e)}")
+            self.smtp.stats.record_error("Send failed", e)
             return self.smtp.stats
+
+    def _send_spooled(self, from_addr: str, to_addr: str, spool):
+        """Drive DATA by hand, streaming a spilled message in chunks.
+
+        Dot-stuffing runs per chunk; each send is cut so it never ends
+        mid-CRLF, which keeps a "\\r\\n." sequence from ever spanning
+        two chunks.
+        """
+        self.smtp.mail(from_addr)
+        self.smtp.rcpt(to_addr)
+        code, resp = self.smtp.docmd('DATA')
+        if code != 354:
+            raise smtplib.SMTPDataError(code, resp)
+
+        sock = self.smtp.sock
+        spool.seek(0)
+        carry = b''
+        tail = b''
+        sent = 0
+        while True:
+            chunk = spool.read(_SPOOL_CHUNK)
+            if not chunk:
+                break
+            work = carry + chunk
+            cut = len(work)
+            while cut > 0 and work[cut - 1] in b'\r\n':
+                cut -= 1
+            if cut == 0:
+                carry = work
+                continue
+            # carry is pure CRLF bytes, so a dot following it still sees
+            # its line start in the next buffer
+            out = work[:cut].replace(b'\r\n.', b'\r\n..')
+            carry = work[cut:]
+            sock.sendall(out)
+            sent += len(out)
+            tail = out[-2:]
+        if carry:
+            sock.sendall(carry)
+            sent += len(carry)
+            tail = carry[-2:]
+        terminator = b'.\r\n' if tail.endswith(b'\r\n') else b'\r\n.\r\n'
+        sock.sendall(terminator)
+
+        self.smtp.stats.bytes_sent += sent + len(terminator)
+        code, resp = self.smtp.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
     
+    def _stream_mime_message(self, from_addr: str, to_addr: str, subject: str,
+                             body: str, attachment_path: str):
+        """Yield the MIME message as wire-ready CRLF byte chunks.
+
+        The attachment base64 comes from the shared per-file cache, so a
+        repeat send of the same file skips the encode entirely; the
+        cached payload is replayed in line-aligned slices. The full
+        message is still never flattened into one buffer the way
+        msg.as_string() would build it.
+        """
+        boundary = f"==={uuid.uuid4().hex}=="
+        yield (f"From: {from_addr}\r\n"
+               f"To: {to_addr}\r\n"
+               f"Subject: {subject}\r\n"
+               "MIME-Version: 1.0\r\n"
+               f'Content-Type: multipart/mixed; boundary="{boundary}"\r\n'
+               "\r\n").encode('utf-8')
+
+        # Normalize line endings to CRLF and dot-stuff the text part so
+        # it cannot terminate DATA early
+        body_bytes = re.sub(rb'\r\n|\r|\n', b'\r\n', body.encode('utf-8'))
+        body_bytes = re.sub(rb'(?m)^\.', b'..', body_bytes)
+        yield (f"--{boundary}\r\n"
+               'Content-Type: text/plain; charset="utf-8"\r\n'
+               "Content-Transfer-Encoding: 8bit\r\n"
+               "\r\n").encode('ascii') + body_bytes + b"\r\n"
+
+        filename = os.path.basename(attachment_path)
+        yield (f"--{boundary}\r\n"
+               "Content-Type: application/octet-stream\r\n"
+               "Content-Transfer-Encoding: base64\r\n"
+               f'Content-Disposition: attachment; filename="{filename}"\r\n'
+               "\r\n").encode('utf-8')
+        payload = memoryview(self._encoded_attachment(attachment_path))
+        for i in range(0, len(payload), _STREAM_CHUNK_B64):
+            yield payload[i:i + _STREAM_CHUNK_B64]
+        yield f"--{boundary}--\r\n".encode('ascii')
+
+    @staticmethod
+    def _sendv(sock: socket.socket, chunks: List[bytes]):
+        """Write a list of buffers with one vectored syscall.
+
+        Falls back to sendall for any tail the kernel didn't accept in
+        the first sendmsg.
+        """
+        total = sum(len(c) for c in chunks)
+        n = sock.sendmsg(chunks)
+        if n < total:
+            sock.sendall(b''.join(chunks)[n:])
+
+    def send_test_email_stream(self, from_addr: str, to_addr: str, subject: str,
+                               body: str, attachment_path: str) -> SMTPStats:
+        """Send an email with a large attachment without buffering it.
+
+        Drives MAIL/RCPT/DATA by hand and streams the MIME message in
+        chunks, avoiding the full-message string that send_test_email
+        builds via msg.as_string().
+        """
+        if not self.smtp:
+            raise RuntimeError("Must connect first")
+
+        send_start = time.monotonic_ns()
+        try:
+            self.smtp.mail(from_addr)
+            self.smtp.rcpt(to_addr)
+            code, resp = self.smtp.docmd('DATA')
+            if code != 354:
+                raise smtplib.SMTPDataError(code, resp)
+
+            sock = self.smtp.sock
+            # SSL sockets have no scatter/gather writes (sendmsg raises
+            # NotImplementedError there), so fall back to per-chunk sends
+            vectored = not isinstance(sock, ssl.SSLSocket)
+
+            sent = 0
+            chunks = 0
+            batch: List[bytes] = []
+            for chunk in self._stream_mime_message(from_addr, to_addr,
+                                                   subject, body,
+                                                   attachment_path):
+                sent += len(chunk)
+                chunks += 1
+                if vectored:
+                    batch.append(chunk)
+                    if len(batch) >= _WRITEV_BATCH:
+                        self._sendv(sock, batch)
+                        batch.clear()
+                else:
+                    sock.sendall(chunk)
+            if batch:
+                self._sendv(sock, batch)
+            sock.sendall(b'.\r\n')
+            sent += 3
+
+            self.smtp.stats.bytes_sent += sent
+            self.smtp.stats.chunks_sent += chunks
+
+            code, resp = self.smtp.getreply()
+            if code != 250:
+                raise smtplib.SMTPDataError(code, resp)
+
+            self.smtp.stats.send_time = (time.monotonic_ns() - send_start) * 1e-9
+            if self.log_callback:
+                self.log_callback(SMTPLogEntry(
+                    timestamp=time.time(),
+                    direction="→",
+                    data=f"Streamed message: {sent:,} bytes in {chunks} chunks",
+                    timing_info=f"{self.smtp.stats.send_time:.3f}s"
+                ))
+            return self.smtp.stats
+        except Exception as e:
+            self.smtp.stats.record_error("Send failed", e)
+            return self.smtp.stats
+
     def disconnect(self):
         """Disconnect from SMTP server."""
         if self.smtp:
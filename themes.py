@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from rich.theme import Theme
 from rich.style import Style
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ThemeColors:
     """Color definitions for a theme."""
     # Basic colors
@@ -97,63 +97,76 @@ LIGHT_THEME = ThemeColors(
     metric_label="grey30"
 )
 
+# Named themes the manager can switch between
+ALL_THEMES = {
+    "dark": DARK_THEME,
+    "light": LIGHT_THEME,
+}
+
+def _build_rich_theme(colors: ThemeColors) -> Theme:
+    """Create a Rich theme object from a set of theme colors."""
+    return Theme({
+        # Basic styles
+        "panel.border": colors.panel_border,
+        "panel.title": colors.panel_title,
+        "panel.background": colors.panel_background,
+
+        # Status styles
+        "status.success": colors.success,
+        "status.warning": colors.warning,
+        "status.error": colors.error,
+        "status.info": colors.info,
+
+        # SMTP protocol styles
+        "smtp.outgoing": colors.smtp_outgoing,
+        "smtp.incoming": colors.smtp_incoming,
+        "smtp.error": colors.smtp_error,
+        "smtp.timing": colors.smtp_timing,
+
+        # UI element styles
+        "button.active": colors.button_active,
+        "button.inactive": colors.button_inactive,
+        "input": colors.input_field,
+        "highlight": colors.highlight,
+
+        # Data visualization
+        "progress": colors.progress_bar,
+        "metric.value": colors.metric_value,
+        "metric.label": colors.metric_label,
+
+        # General text
+        "text": colors.foreground,
+        "background": colors.background,
+    })
+
+# The color tables never change at runtime, so the Rich Theme objects
+# (and their parsed Style strings) are built exactly once at import
+RICH_THEMES = {name: _build_rich_theme(colors) for name, colors in ALL_THEMES.items()}
+
 class ThemeManager:
     """Manages theme switching and provides Rich theme objects."""
-    
+
     def __init__(self, default_theme: str = "dark"):
         self.current_theme_name = default_theme
-        self.current_theme = DARK_THEME if default_theme == "dark" else LIGHT_THEME
-        self.rich_theme = self._create_rich_theme()
-    
+        self.current_theme = ALL_THEMES.get(default_theme, DARK_THEME)
+
+    @property
+    def rich_theme(self) -> Theme:
+        """The Rich theme object for the current theme."""
+        return RICH_THEMES.get(self.current_theme_name, RICH_THEMES["dark"])
+
     def toggle_theme(self):
         """Toggle between light and dark themes."""
         if self.current_theme_name == "dark":
             self.set_theme("light")
         else:
             self.set_theme("dark")
-    
+
     def set_theme(self, theme_name: str):
         """Set the theme to light or dark."""
         self.current_theme_name = theme_name
-        self.current_theme = DARK_THEME if theme_name == "dark" else LIGHT_THEME
-        self.rich_theme = self._create_rich_theme()
-    
-    def _create_rich_theme(self) -> Theme:
-        """Create a Rich theme object from current theme colors."""
-        return Theme({
-            # Basic styles
-            "panel.border": self.current_theme.panel_border,
-            "panel.title": self.current_theme.panel_title,
-            "panel.background": self.current_theme.panel_background,
-            
-            # Status styles
-            "status.success": self.current_theme.success,
-            "status.warning": self.current_theme.warning,
-            "status.error": self.current_theme.error,
-            "status.info": self.current_theme.info,
-            
-            # SMTP protocol styles
-            "smtp.outgoing": self.current_theme.smtp_outgoing,
-            "smtp.incoming": self.current_theme.smtp_incoming,
-            "smtp.error": self.current_theme.smtp_error,
-            "smtp.timing": self.current_theme.smtp_timing,
-            
-            # UI element styles
-            "button.active": self.current_theme.button_active,
-            "button.inactive": self.current_theme.button_inactive,
-            "input": self.current_theme.input_field,
-            "highlight": self.current_theme.highlight,
-            
-            # Data visualization
-            "progress": self.current_theme.progress_bar,
-            "metric.value": self.current_theme.metric_value,
-            "metric.label": self.current_theme.metric_label,
-            
-            # General text
-            "text": self.current_theme.foreground,
-            "background": self.current_theme.background,
-        })
-    
+        self.current_theme = ALL_THEMES.get(theme_name, DARK_THEME)
+
     def get_progress_style(self) -> str:
         """Get the progress bar style for current theme."""
         return self.current_theme.progress_bar